@@ -1,3 +1,5 @@
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -5,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.session import get_db
+from app.models.user import User
 from app.schemas.user import TokenData
 
 # Constants
@@ -15,6 +18,44 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Short-lived email->user cache so authenticated requests don't pay one
+# user SELECT each. The TTL bounds staleness (e.g. deactivated accounts).
+_USER_CACHE_TTL = 60.0
+_USER_CACHE_MAX = 1024
+_user_cache = {}
+
+# The scalar columns cached per user. Only plain values go in the cache
+# — never the session-tracked instance, which its owning session's
+# request teardown would detach, turning later cache hits into
+# DetachedInstanceError on first attribute access.
+_USER_CACHE_COLUMNS = (
+    "id", "email", "hashed_password", "full_name",
+    "is_active", "is_superuser", "created_at",
+)
+
+def _get_user_cached(db: Session, email: str):
+    """Fetch a user by email through the in-process TTL cache.
+
+    Hits rebuild a fresh detached User from the cached column values,
+    so every request gets its own instance with loaded attributes and
+    nothing shared across threads or sessions.
+    """
+    now = time.monotonic()
+    hit = _user_cache.get(email)
+    if hit is not None and hit[0] > now:
+        return User(**hit[1])
+
+    # Import inside function to avoid circular import
+    from app.crud.user import get_user_by_email
+
+    user = get_user_by_email(db, email=email)
+    if user is not None:
+        if len(_user_cache) >= _USER_CACHE_MAX:
+            _user_cache.clear()
+        values = {column: getattr(user, column) for column in _USER_CACHE_COLUMNS}
+        _user_cache[email] = (now + _USER_CACHE_TTL, values)
+    return user
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """Get the current user from the token."""
     credentials_exception = HTTPException(
@@ -32,13 +73,10 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
     
-    # Import inside function to avoid circular import
-    from app.crud.user import get_user_by_email
-    
-    user = get_user_by_email(db, email=token_data.email)
+    user = _get_user_cached(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    
+
     return user
 
 def get_current_active_user(current_user = Depends(get_current_user)):
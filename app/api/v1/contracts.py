@@ -1,16 +1,43 @@
 # app/api/v1/contracts.py
-from typing import List
+import asyncio
+import hashlib
+import logging
+import re
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.crud.contract import create_contract, get_contract, get_user_contracts, update_contract_analysis
+from app.crud.contract import (
+    create_contract,
+    create_contracts_bulk,
+    get_cached_analysis,
+    get_contracts_by_ids,
+    get_contract,
+    get_contract_analysis_state,
+    get_contract_owner,
+    get_user_contracts,
+    search_user_contracts,
+    store_cached_analysis,
+    update_contract_analysis,
+    update_contract_status,
+)
+from app.db.session import SessionLocal
+from app.models.contract import AnalysisStatus
 from app.models.user import User
-from app.schemas.contract import Contract, ContractCreate, ContractResponse
+from app.schemas.contract import Contract, ContractCreate, ContractListResponse, ContractResponse
 from app.api.deps import get_current_user, get_db
 from app.services.file_parser import parse_contract_text
 from app.services.contract_analyzer import analyze_contract_text
-from app.schemas.analysis import ContractAnalysisResponse, ContractAnalysis
+from app.schemas.analysis import AnalysisJobStatus, ContractAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Cheap triage before the full analysis pipeline: documents that are tiny
+# or contain none of the clause keyword stems cannot produce a match.
+_MIN_ANALYZABLE_LENGTH = 200
+_TRIAGE_RE = re.compile(r"terminat|confidential|liab|govern|payment", re.IGNORECASE)
 
 router = APIRouter()
 
@@ -42,93 +69,200 @@ async def upload_contract(
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
-    except Exception as e:
-        # Log the error
-        print(f"Error processing contract: {str(e)}")
+    except Exception:
+        logger.exception("Error processing contract")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process contract. Please try again."
         )
 
 
-@router.get("/", response_model=List[ContractResponse])
-def list_user_contracts(
-    skip: int = 0,
+@router.post("/upload_batch", response_model=List[ContractResponse], status_code=status.HTTP_201_CREATED)
+async def upload_contracts_batch(
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload and parse several contract files in one request.
+    Files are parsed concurrently and inserted with a single bulk
+    INSERT, so N uploads cost one transaction instead of N.
+    """
+    try:
+        parsed = await asyncio.gather(*(parse_contract_text(f) for f in files))
+
+        contracts_in = [
+            ContractCreate(
+                filename=f.filename,
+                file_type=file_type,
+                content=content,
+                user_id=current_user.id
+            )
+            for f, (file_type, content) in zip(files, parsed)
+        ]
+
+        contract_ids = create_contracts_bulk(db=db, contracts=contracts_in)
+        return get_contracts_by_ids(db=db, contract_ids=contract_ids)
+
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception:
+        logger.exception("Error processing contract batch")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process contracts. Please try again."
+        )
+
+
+@router.get("/", response_model=ContractListResponse)
+async def list_user_contracts(
+    cursor_id: Optional[int] = None,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all contracts uploaded by the current user."""
-    contracts = get_user_contracts(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    """
+    Get contracts uploaded by the current user, newest first.
+    Pass the returned next_cursor_id to fetch the following page. The
+    cursor is the contract id — monotonic with upload order and exact,
+    unlike the second-granular upload timestamp which whole batch
+    uploads share.
+    """
+    # Only the blocking DB call goes to the threadpool; the handler itself
+    # runs on the event loop instead of occupying a worker thread end to end.
+    contracts = await run_in_threadpool(
+        get_user_contracts, db=db, user_id=current_user.id,
+        cursor_id=cursor_id, limit=limit
     )
-    return contracts
+    next_cursor_id = contracts[-1].id if len(contracts) == limit else None
+    return ContractListResponse(items=contracts, next_cursor_id=next_cursor_id)
+
+
+@router.get("/search", response_model=List[ContractResponse])
+def search_contracts(
+    q: str,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full-text search over the current user's contract contents."""
+    return search_user_contracts(db=db, user_id=current_user.id, query=q, limit=limit)
 
 
 @router.get("/{contract_id}", response_model=Contract)
-def get_contract_detail(
+async def get_contract_detail(
     contract_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific contract including its content."""
-    contract = get_contract(db=db, contract_id=contract_id)
-    if not contract:
+    # Authorize on a scalar user_id read first; the heavy row (content,
+    # analysis JSON) is only loaded once ownership checks out.
+    owner_id = await run_in_threadpool(get_contract_owner, db=db, contract_id=contract_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Contract not found")
-    if contract.user_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return contract
+    return await run_in_threadpool(get_contract, db=db, contract_id=contract_id)
+
+async def run_analysis(contract_id: int):
+    """
+    Background job: analyze a contract and persist the results.
+    Opens its own session so the request session is never leaked
+    into the background task.
+    """
+    db = SessionLocal()
+    try:
+        contract = get_contract(db=db, contract_id=contract_id)
+        if not contract:
+            return
+
+        update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.running)
 
-@router.post("/{contract_id}/analyze", response_model=ContractAnalysisResponse)
+        content = contract.content or ""
+        if len(content) < _MIN_ANALYZABLE_LENGTH or not _TRIAGE_RE.search(content):
+            # Nothing for the analyzer to find; record the default result.
+            update_contract_analysis(
+                db=db, contract_id=contract_id, analysis_results=ContractAnalysis().model_dump()
+            )
+            update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.done)
+            return
+
+        # Identical content (re-analysis, shared templates) hits the cache
+        # and skips the full extraction pipeline entirely.
+        content_sha256 = contract.content_sha256 or hashlib.sha256(contract.content.encode()).hexdigest()
+        analysis_results = get_cached_analysis(db=db, content_sha256=content_sha256)
+
+        if analysis_results is None:
+            analysis_results = await analyze_contract_text(contract.content)
+
+            if "error" in analysis_results:
+                update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.error)
+                return
+
+            store_cached_analysis(db=db, content_sha256=content_sha256, result=analysis_results)
+
+        update_contract_analysis(db=db, contract_id=contract_id, analysis_results=analysis_results)
+        update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.done)
+
+    except Exception:
+        logger.exception("Error analyzing contract %s", contract_id)
+        # A DB error mid-job leaves the transaction in a failed state;
+        # without a rollback the status write below would raise
+        # PendingRollbackError and the contract would sit in "running"
+        # forever while clients poll.
+        db.rollback()
+        update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.error)
+    finally:
+        db.close()
+
+
+@router.post("/{contract_id}/analyze", response_model=AnalysisJobStatus, status_code=status.HTTP_202_ACCEPTED)
 async def analyze_contract(
     contract_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Analyze contract text for specific clauses.
-    This endpoint will return the analysis results including
-    termination clause, confidentiality clause, payment terms,
-    governing law, and limitation of liability.
+    Enqueue a background analysis of the contract text.
+    Returns 202 Accepted immediately; poll GET /{contract_id}/analysis
+    for the persisted results. Running the analyzer out of band keeps
+    the HTTP worker and its DB connection free during the analysis.
     """
-    contract = get_contract(db=db, contract_id=contract_id)
-    if not contract:
+    # The handler only needs ownership; the background job loads the content.
+    owner_id = get_contract_owner(db=db, contract_id=contract_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Contract not found")
-    
-    if contract.user_id != current_user.id:
+
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    try:
-        analysis_results = await analyze_contract_text(contract.content)
-        
-        if "error" in analysis_results:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=analysis_results["error"]
-            )
 
-        updated_contract = update_contract_analysis(
-            db=db, 
-            contract_id=contract_id, 
-            analysis_results=analysis_results
-        )
+    update_contract_status(db=db, contract_id=contract_id, analysis_status=AnalysisStatus.pending)
+    background_tasks.add_task(run_analysis, contract_id)
 
-        analysis = ContractAnalysis(
-            termination_clause=analysis_results.get("termination_clause", "Not found"),
-            confidentiality_clause=analysis_results.get("confidentiality_clause", "Not found"),
-            payment_terms=analysis_results.get("payment_terms", "Not found"),
-            governing_law=analysis_results.get("governing_law", "Not found"),
-            limitation_of_liability=analysis_results.get("limitation_of_liability", "Not found")
-        )
-        
-        return ContractAnalysisResponse(
-            contract_id=contract_id,
-            analysis=analysis
-        )
-        
-    except Exception as e:
-        print(f"Error analyzing contract: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to analyze contract: {str(e)}"
-        )
\ No newline at end of file
+    return AnalysisJobStatus(contract_id=contract_id, status=AnalysisStatus.pending)
+
+
+@router.get("/{contract_id}/analysis", response_model=AnalysisJobStatus)
+def get_contract_analysis(
+    contract_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the status and persisted results of a contract analysis job."""
+    owner_id = get_contract_owner(db=db, contract_id=contract_id)
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    analysis_status, analysis_results = get_contract_analysis_state(db=db, contract_id=contract_id)
+
+    return AnalysisJobStatus(
+        contract_id=contract_id,
+        status=analysis_status,
+        analysis=analysis_results
+    )
\ No newline at end of file
@@ -0,0 +1,26 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Configure root logging through a queue.
+    Handlers only enqueue records; formatting and stream I/O happen on the
+    listener's background thread, so request paths never block on stderr.
+    """
+    log_queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener.start()
+    return listener
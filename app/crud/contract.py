@@ -1,29 +1,143 @@
+import hashlib
 from typing import List, Optional, Dict, Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, undefer
 
-from app.models.contract import Contract
+from app.models.contract import AnalysisCache, Contract
 from app.schemas.contract import ContractCreate
 
 def create_contract(db: Session, contract: ContractCreate) -> Contract:
-    db_contract = Contract(
-        user_id=contract.user_id,
-        filename=contract.filename,
-        file_type=contract.file_type,
-        content=contract.content
+    # INSERT ... RETURNING hands back the fully populated row (including
+    # the server-side uploaded_at) in one round trip, with no refresh SELECT.
+    stmt = (
+        insert(Contract)
+        .values(
+            user_id=contract.user_id,
+            filename=contract.filename,
+            file_type=contract.file_type,
+            content=contract.content,
+            content_sha256=hashlib.sha256(contract.content.encode()).hexdigest(),
+        )
+        .returning(Contract)
     )
-    db.add(db_contract)
+    db_contract = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(db_contract)
     return db_contract
 
 
+def create_contracts_bulk(db: Session, contracts: List[ContractCreate]) -> List[int]:
+    """
+    Insert many contracts in a single statement and transaction.
+    Amortizes the COMMIT and round trip across all rows; returns new ids.
+    """
+    if not contracts:
+        return []
+    rows = [
+        {
+            "user_id": c.user_id,
+            "filename": c.filename,
+            "file_type": c.file_type,
+            "content": c.content,
+            "content_sha256": hashlib.sha256(c.content.encode()).hexdigest(),
+        }
+        for c in contracts
+    ]
+    ids = db.execute(insert(Contract).returning(Contract.id), rows).scalars().all()
+    db.commit()
+    return list(ids)
+
+
+def get_contract_owner(db: Session, contract_id: int) -> Optional[int]:
+    """Fetch only the owning user_id — a scalar read for authorization checks."""
+    return db.query(Contract.user_id).filter(Contract.id == contract_id).scalar()
+
+
+def get_contract_analysis_state(db: Session, contract_id: int) -> Optional[tuple]:
+    """Fetch (analysis_status, analysis_results) without the content blob."""
+    return (
+        db.query(Contract.analysis_status, Contract.analysis_results)
+        .filter(Contract.id == contract_id)
+        .first()
+    )
+
+
+def get_contracts_by_ids(db: Session, contract_ids: List[int]) -> List[Contract]:
+    return db.query(Contract).filter(Contract.id.in_(contract_ids)).all()
+
+
 def get_contract(db: Session, contract_id: int) -> Optional[Contract]:
-    return db.query(Contract).filter(Contract.id == contract_id).first()
+    # Single-row fetch: undefer the heavy columns up front so the detail
+    # and analyze paths don't pay a second round trip per attribute.
+    return (
+        db.query(Contract)
+        .options(undefer(Contract.content), undefer(Contract.analysis_results))
+        .filter(Contract.id == contract_id)
+        .first()
+    )
+
+
+def get_user_contracts(db: Session, user_id: int, cursor_id: Optional[int] = None,
+                       limit: int = 100) -> List[Contract]:
+    # Eager-load the user relationship so serializers touching contract.user
+    # never trigger one SELECT per row (N+1).
+    # Keyset pagination on id: seek past the cursor instead of OFFSET-scanning
+    # prior pages; backed by the (user_id, id) index. Ids are monotonic with
+    # upload order, so id DESC is newest-first, and unlike uploaded_at the
+    # comparison is exact: SQLite stores the server-default timestamp without
+    # fractional seconds while bound datetimes carry ".000000", so an
+    # uploaded_at cursor never compares equal to the column it came from.
+    query = (
+        db.query(Contract)
+        .options(selectinload(Contract.user))
+        .filter(Contract.user_id == user_id)
+    )
+    if cursor_id is not None:
+        query = query.filter(Contract.id < cursor_id)
+    return query.order_by(Contract.id.desc()).limit(limit).all()
 
 
-def get_user_contracts(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Contract]:
-    return db.query(Contract).filter(Contract.user_id == user_id).offset(skip).limit(limit).all()
+def search_user_contracts(db: Session, user_id: int, query: str, limit: int = 20) -> List[Contract]:
+    """
+    Full-text search over a user's contracts.
+    Uses the FTS5 index on SQLite (index lookup instead of scanning every
+    Text blob); falls back to a LIKE filter on other backends.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        # FTS5 treats quotes, parentheses and bare AND/OR/NOT as query
+        # syntax, so raw input like '"' or a trailing AND would raise
+        # OperationalError. Quote every token (doubling embedded quotes)
+        # so terms always match literally; adjacent quoted tokens are
+        # implicitly ANDed.
+        tokens = query.split()
+        if not tokens:
+            return []
+        fts_query = " ".join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+
+        ids = db.execute(
+            text(
+                "SELECT c.id FROM contracts_fts f "
+                "JOIN contracts c ON c.id = f.rowid "
+                "WHERE contracts_fts MATCH :query AND c.user_id = :user_id "
+                "ORDER BY rank LIMIT :limit"
+            ),
+            {"query": fts_query, "user_id": user_id, "limit": limit},
+        ).scalars().all()
+        if not ids:
+            return []
+
+        # The IN (...) refetch returns rows in table order; put them
+        # back in the relevance order the FTS query produced.
+        contracts = {contract.id: contract for contract in get_contracts_by_ids(db, list(ids))}
+        return [contracts[contract_id] for contract_id in ids if contract_id in contracts]
+
+    return (
+        db.query(Contract)
+        .filter(Contract.user_id == user_id, Contract.content.contains(query))
+        .limit(limit)
+        .all()
+    )
 
 
 def delete_contract(db: Session, contract_id: int) -> bool:
@@ -36,11 +150,42 @@ def delete_contract(db: Session, contract_id: int) -> bool:
 
 
 def update_contract_analysis(db: Session, contract_id: int, analysis_results: Dict[str, Any]) -> Optional[Contract]:
-    """Update a contract with analysis results."""
+    """Update a contract with analysis results in a single UPDATE ... RETURNING."""
+    stmt = (
+        update(Contract)
+        .where(Contract.id == contract_id)
+        .values(analysis_results=analysis_results)
+        .returning(Contract)
+    )
+    contract = db.execute(stmt).scalar_one_or_none()
+    db.commit()
+    return contract
+
+
+def get_cached_analysis(db: Session, content_sha256: str) -> Optional[Dict[str, Any]]:
+    """Look up a persisted analysis result by content hash."""
+    entry = db.query(AnalysisCache).filter(AnalysisCache.content_sha256 == content_sha256).first()
+    return entry.result if entry else None
+
+
+def store_cached_analysis(db: Session, content_sha256: str, result: Dict[str, Any]) -> None:
+    """Persist an analysis result under its content hash (ignore races)."""
+    if db.query(AnalysisCache).filter(AnalysisCache.content_sha256 == content_sha256).first():
+        return
+    db.add(AnalysisCache(content_sha256=content_sha256, result=result))
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent job cached the same content between the check
+        # and the commit; the row exists, which is all that matters.
+        db.rollback()
+
+
+def update_contract_status(db: Session, contract_id: int, analysis_status: str) -> Optional[Contract]:
+    """Update the analysis job status of a contract."""
     contract = db.query(Contract).filter(Contract.id == contract_id).first()
     if contract:
-        contract.analysis_results = analysis_results
+        contract.analysis_status = analysis_status
         db.commit()
-        db.refresh(contract)
         return contract
     return None
\ No newline at end of file
@@ -1,3 +1,3 @@
 from app.db.base_class import Base  
 from app.models.user import User  
-from app.models.contract import Contract 
\ No newline at end of file
+from app.models.contract import AnalysisCache, Contract
\ No newline at end of file
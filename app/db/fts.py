@@ -0,0 +1,48 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# External-content FTS5 index over contracts.content, kept in sync by
+# triggers so full-text search is an index lookup instead of a Text scan.
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts
+    USING fts5(content, content='contracts', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contracts_fts_ai AFTER INSERT ON contracts BEGIN
+        INSERT INTO contracts_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contracts_fts_ad AFTER DELETE ON contracts BEGIN
+        INSERT INTO contracts_fts(contracts_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contracts_fts_au AFTER UPDATE OF content ON contracts BEGIN
+        INSERT INTO contracts_fts(contracts_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO contracts_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+
+def create_contracts_fts(engine: Engine) -> None:
+    """Create the FTS5 table and sync triggers. SQLite only; no-op elsewhere."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contracts_fts'")
+        ).first() is not None
+        for ddl in _FTS_DDL:
+            conn.execute(text(ddl))
+        if not existed:
+            # The triggers only index rows inserted from now on; a database
+            # that already holds contracts (first deploy of the index over a
+            # persisted file) needs its rows indexed too. 'rebuild' scans the
+            # external-content table once; skipped when the index already
+            # existed so restarts don't re-index everything.
+            conn.execute(text("INSERT INTO contracts_fts(contracts_fts) VALUES ('rebuild')"))
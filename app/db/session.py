@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -9,12 +9,45 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./contract_analyz
 # For SQLite, connect_args is needed
 connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool tuning: recycle stale connections and ping before checkout so dead
+# connections never reach a request. Size limits only apply to real
+# client/server pools, not SQLite's file handle.
+engine_kwargs = {"pool_recycle": 3600, "pool_pre_ping": True}
+if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine_kwargs.update(pool_size=20, max_overflow=40)
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, **engine_kwargs)
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    # WAL lets readers proceed while a writer commits, and the larger
+    # cache/mmap settings keep hot pages out of the syscall path. Applied
+    # per-connection because pragmas don't persist across connections.
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# expire_on_commit=False keeps instances populated after commit.
+# Sessions here are per-request (or per-background-job) and objects are
+# only read before teardown, so the staleness window is nil — and the
+# INSERT/UPDATE ... RETURNING paths in the CRUD layer rely on it, since
+# expiring would re-SELECT on first attribute access the very row
+# RETURNING just handed back.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
-# Dependency to get DB session
+# Dependency to get DB session. One plain Session per request: a
+# thread-local scoped_session registry is unsafe here because FastAPI
+# runs a sync dependency's setup, the endpoint's threadpool calls and
+# the teardown on arbitrary worker threads, so a request has no thread
+# affinity and registry sessions would be shared and removed across
+# concurrent requests.
 def get_db():
     db = SessionLocal()
     try:
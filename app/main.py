@@ -1,17 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import auth
 from app.api.v1 import contracts
+from app.core.logging import setup_logging
 from app.models.user import Base
+from app.db.fts import create_contracts_fts
 from app.db.session import engine
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = setup_logging()
+    # Dev convenience: create tables at startup rather than at import time,
+    # so importing the app module never touches the database.
+    Base.metadata.create_all(bind=engine)
+    create_contracts_fts(engine)
+    yield
+    listener.stop()
+
 
 app = FastAPI(
     title="Contract Analyzer API",
     description="API for analyzing legal contracts",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes the string-heavy analysis payloads straight to
+    # bytes, several times faster than the stdlib json encoder.
+    default_response_class=ORJSONResponse,
 )
 
 # Middleware for CORS
@@ -1,18 +1,43 @@
 # app/models/contract.py (updated)
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
-from sqlalchemy.orm import relationship
+import enum
+
+from sqlalchemy import Column, Index, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
-from app.db.base_class import Base  
+from app.db.base_class import Base
+
+class AnalysisStatus(str, enum.Enum):
+    """Lifecycle of a background analysis job for a contract."""
+    pending = "pending"
+    running = "running"
+    done = "done"
+    error = "error"
 
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Covers the list query: filter by user, id-keyset seeks, newest first.
+        Index("ix_contracts_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     filename = Column(String(255), nullable=False)
     file_type = Column(String(10), nullable=False)  # 'pdf' or 'docx'
-    content = Column(Text, nullable=False)
+    # Deferred: the full text is only loaded when explicitly requested
+    # (detail/analyze paths), keeping list queries light.
+    content = deferred(Column(Text, nullable=False))
+    content_sha256 = Column(String(64), index=True, nullable=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
-    analysis_results = Column(JSON, nullable=True) 
-    user = relationship("User", back_populates="contracts")
\ No newline at end of file
+    analysis_status = Column(String(10), nullable=True)  # AnalysisStatus value, null = never requested
+    analysis_results = deferred(Column(JSON, nullable=True))
+    user = relationship("User", back_populates="contracts")
+
+class AnalysisCache(Base):
+    """Analysis results keyed by content hash, shared across identical contracts."""
+    __tablename__ = "analysis_cache"
+
+    content_sha256 = Column(String(64), primary_key=True)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -1,30 +1,27 @@
 from typing import Optional
-from pydantic import BaseModel
-
-class ClauseResult(BaseModel):
-    text: str
-    confidence: float
-    found: bool
+from pydantic import BaseModel, ConfigDict
 
 class ContractAnalysis(BaseModel):
     """
     Schema for contract analysis results.
-    This schema includes various clauses that are typically found in contracts.
+    Defaults and extra="ignore" let the raw analyzer dict validate in a
+    single model_validate pass without plucking keys by hand.
     """
-    termination: ClauseResult
-    confidentiality: ClauseResult 
-    payment_terms: ClauseResult
-    governing_law: ClauseResult
-    liability: ClauseResult
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    termination_clause: str = "Not found"
+    confidentiality_clause: str = "Not found"
+    payment_terms: str = "Not found"
+    governing_law: str = "Not found"
+    limitation_of_liability: str = "Not found"
 
-class ContractAnalysisResponse(BaseModel):
+class AnalysisJobStatus(BaseModel):
     """
-    Schema for contract analysis API response.
-    This schema includes the contract ID and the analysis results.
+    Schema for the status of a background analysis job.
+    Returned when an analysis is enqueued and when its result is polled.
     """
+    model_config = ConfigDict(frozen=True)
+
     contract_id: int
-    analysis: ContractAnalysis
-    engine: str 
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    status: Optional[str] = None
+    analysis: Optional[ContractAnalysis] = None
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ContractBase(BaseModel):
@@ -29,10 +29,16 @@ class Contract(ContractInDB):
 
 
 class ContractResponse(BaseModel):
+    # Frozen + slotted-style storage: response models never mutate after
+    # validation, so skip per-instance __dict__ mutation bookkeeping.
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     id: int
     filename: str
     file_type: str
     uploaded_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+
+class ContractListResponse(BaseModel):
+    items: List[ContractResponse]
+    next_cursor_id: Optional[int] = None
\ No newline at end of file
@@ -1,9 +1,17 @@
+import hashlib
+import heapq
 import json
 import logging
+import pickle
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 try:
     import nltk
     from nltk.tokenize import sent_tokenize
@@ -11,6 +19,45 @@ try:
 except ImportError:
     NLTK_AVAILABLE = False
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+from . import regex_engine
+
+
+def _score_keyword_base(counts, primary_w, secondary_w):
+    """
+    Batched keyword scoring over an (n_segments, 3, n_clauses) count
+    tensor (primary/secondary/negative along axis 1). Returns the base
+    confidence per (segment, clause) cell, with -1.0 marking cells
+    rejected by a negative keyword. JIT-compiled when numba is present.
+    """
+    n_segments, _, n_clauses = counts.shape
+    out = np.empty((n_segments, n_clauses), dtype=np.float32)
+    for s in range(n_segments):
+        for c in range(n_clauses):
+            if counts[s, 2, c] > 0:
+                out[s, c] = -1.0
+                continue
+            score = min(1.0, counts[s, 0, c] * primary_w[c]) if counts[s, 0, c] else 0.0
+            if counts[s, 1, c]:
+                score += min(1.0, counts[s, 1, c] * secondary_w[c])
+            out[s, c] = score
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _score_keyword_base = njit(cache=True)(_score_keyword_base)
+
 
 class ClauseExtractor:
     """Rule-based clause extractor for contract analysis."""
@@ -28,16 +75,96 @@ class ClauseExtractor:
         self.clause_definitions: Dict = {}
         self.global_config: Dict = {}
         self.compiled_patterns: Dict = {}
-        
-        # Initialize NLTK if available
-        self._initialize_nltk()
-        
-        # Load configuration and set up preprocessing
-        self._load_clause_definitions()
-        self._setup_preprocessing()
-        
+
+        # NLTK resources are initialized lazily on first sentence split so
+        # constructing the extractor (at module import) stays cheap and
+        # never touches the network for the punkt download check.
+        self._nltk_initialized = False
+        self._punkt = None
+
+        # Retries and repeated analyses hit the same text; cache the
+        # expensive preprocessing and sentence splits (tuples, hashable).
+        self._preprocess_cached = lru_cache(maxsize=256)(self._preprocess_uncached)
+        self._sentences_cached = lru_cache(maxsize=256)(self._split_uncached)
+        # Sliding windows repeat the same text across window sizes and
+        # clause types share pattern-less definitions, so pattern matching
+        # is memoized on (clause, text) as well.
+        self._match_patterns_cached = lru_cache(maxsize=4096)(self._match_patterns_uncached)
+        # Full extraction results keyed by blake2b digest of the input
+        self._extract_cache: Dict[bytes, List[Dict]] = {}
+
+        # Load configuration and set up preprocessing. The fully compiled
+        # bundle is cached on disk, so warm starts skip the JSON parse and
+        # every re.compile.
+        if not self._load_compiled_cache():
+            self._load_clause_definitions()
+            self._setup_preprocessing()
+            self._save_compiled_cache()
+
+    # Everything _load_clause_definitions/_setup_preprocessing derive from
+    # the config file; restoring these from the pickle cache is equivalent
+    # to re-running both.
+    _DERIVED_ATTRS = (
+        'clause_definitions', 'global_config', 'compiled_patterns',
+        'default_case_sensitive', 'default_confidence_threshold', '_ci',
+        '_clause_order', '_primary_w', '_secondary_w',
+        '_fused_patterns', '_fused_keyword_map', '_fused_automata',
+        '_sentence_boundary_re', '_ws_re', '_normalize_tbl',
+    )
+
+    def _compiled_cache_path(self) -> Path:
+        return Path.home() / '.cache' / 'contract_analyzer' / f'{self.config_path.stem}.compiled.pkl'
+
+    def _compiled_cache_key(self) -> Tuple:
+        """Invalidates on config edits, interpreter or re upgrades."""
+        return (
+            str(self.config_path.resolve()),
+            self.config_path.stat().st_mtime_ns,
+            sys.version_info[:3],
+            getattr(re, '__version__', ''),
+        )
+
+    def _load_compiled_cache(self) -> bool:
+        """Restore the compiled pattern bundle from disk if still valid."""
+        try:
+            cache_path = self._compiled_cache_path()
+            if not cache_path.exists():
+                return False
+            with open(cache_path, 'rb') as file:
+                payload = pickle.load(file)
+            if payload.get('key') != self._compiled_cache_key():
+                return False
+            for name in self._DERIVED_ATTRS:
+                setattr(self, name, payload['state'][name])
+            self.logger.debug(f"Loaded compiled patterns from cache: {cache_path}")
+            return True
+        except Exception as e:
+            # A stale or unreadable cache is never fatal; fall back to a
+            # full compile.
+            self.logger.debug(f"Compiled-pattern cache unusable: {e}")
+            return False
+
+    def _save_compiled_cache(self) -> None:
+        """Persist the compiled pattern bundle for the next startup."""
+        try:
+            cache_path = self._compiled_cache_path()
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                'key': self._compiled_cache_key(),
+                'state': {name: getattr(self, name) for name in self._DERIVED_ATTRS},
+            }
+            with open(cache_path, 'wb') as file:
+                pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # RE2 pattern objects, for instance, do not pickle; skip caching
+            self.logger.debug(f"Could not write compiled-pattern cache: {e}")
+
     def _initialize_nltk(self) -> None:
-        """Initialize NLTK resources if available."""
+        """Initialize NLTK resources if available. Runs once, on first use."""
+        global NLTK_AVAILABLE
+        if self._nltk_initialized:
+            return
+        self._nltk_initialized = True
         if NLTK_AVAILABLE:
             try:
                 # Download punkt tokenizer if not already available
@@ -48,9 +175,17 @@ class ClauseExtractor:
                     self.logger.info("Downloaded NLTK punkt tokenizer")
                 except Exception as e:
                     self.logger.warning(f"Failed to download NLTK punkt tokenizer: {e}")
-                    global NLTK_AVAILABLE
                     NLTK_AVAILABLE = False
-        
+
+        if NLTK_AVAILABLE:
+            try:
+                # Load the tokenizer once; sent_tokenize re-resolves it from
+                # nltk.data on every call.
+                self._punkt = nltk.data.load('tokenizers/punkt/english.pickle')
+            except Exception as e:
+                self.logger.warning(f"Failed to load punkt tokenizer directly: {e}")
+
+
         if not NLTK_AVAILABLE:
             self.logger.info("NLTK not available, using regex-based sentence segmentation")
     
@@ -119,28 +254,180 @@ class ClauseExtractor:
         # Set up basic text preprocessing parameters
         self.default_case_sensitive = self.global_config.get('default_case_sensitive', False)
         self.default_confidence_threshold = self.global_config.get('default_confidence_threshold', 0.5)
+        # Case-insensitive matching is done by folding the haystack once
+        # per segment and compiling lowered literals WITHOUT re.IGNORECASE,
+        # instead of paying per-position casefolding in every regex call.
+        self._ci = not self.default_case_sensitive
         
         # Compile regex patterns for each clause type
         for clause_type, definition in self.clause_definitions.items():
             self._compile_patterns_for_clause(clause_type, definition)
-            
+
             # Convert text patterns to regex patterns
             if "patterns" in definition and isinstance(definition["patterns"], list):
                 definition["regex_patterns"] = self._convert_patterns_to_regex(definition["patterns"])
             else:
                 definition["regex_patterns"] = []
-        
+
+            # Pre-compile structured pattern objects ({"regex": ...}) so
+            # match_patterns never compiles in the per-segment path.
+            definition["_structured_compiled"] = []
+            for pattern_obj in definition.get("patterns", []):
+                if isinstance(pattern_obj, dict) and "regex" in pattern_obj:
+                    try:
+                        compiled = regex_engine.compile(pattern_obj["regex"], re.IGNORECASE)
+                        definition["_structured_compiled"].append((pattern_obj["regex"], compiled))
+                    except re.error as e:
+                        self.logger.warning(f"Invalid regex in pattern object: {e}")
+
+        # Fuse the per-clause keyword alternations into shared databases
+        self._build_fused_keyword_patterns()
+
+        # Precompiled sentence-boundary scanner for the regex fallback:
+        # split on end punctuation followed by a capitalized word, with
+        # fixed-width lookbehinds guarding common abbreviations (Python's
+        # re does not allow a variable-width lookbehind alternation).
+        abbreviations = ['Mr', 'Mrs', 'Ms', 'Dr', 'Prof', 'Corp', 'Inc', 'Ltd',
+                         'Co', 'vs', 'etc', 'al', 'Jr', 'Sr', 'Ph\\.D', 'M\\.D',
+                         'B\\.A', 'M\\.A']
+        guards = ''.join(f'(?<!\\b{abbr})' for abbr in abbreviations)
+        # Lookarounds rule out RE2 here; regex_engine falls through to the
+        # best engine that accepts the pattern.
+        self._sentence_boundary_re = regex_engine.compile(guards + r'[.!?]+\s+(?=[A-Z])')
+        self._ws_re = regex_engine.compile(r'\s+')
+
+        # One-pass translation table for quote/dash normalization; replaces
+        # six chained str.replace passes in preprocessing.
+        self._normalize_tbl = str.maketrans({
+            '“': '"', '”': '"',
+            '‘': "'", '’': "'",
+            '–': '-', '—': '-',
+        })
+
         self.logger.debug("Text preprocessing setup completed")
+
+    def _build_fused_keyword_patterns(self) -> None:
+        """
+        Fuse each keyword kind (primary/secondary/negative) across ALL
+        clause types into a single alternation plus a keyword -> clause
+        index map. A segment can then be scanned once per kind — one
+        linear pass reporting hits for every clause type — instead of
+        once per (clause type, kind) pair.
+
+        The matched-text map attributes hits instead of per-keyword named
+        groups: it keeps the alternation plain (so RE2 and the engine's
+        literal prefix trie apply) and sidesteps group-count limits on
+        large keyword sets.
+        """
+        self._clause_order = list(self.clause_definitions.keys())
+
+        # Per-clause weight vectors for the batched scoring kernel
+        self._primary_w = np.array([
+            self.clause_definitions[c].get('confidence_weights', {}).get('primary_keyword_match', 0.4)
+            for c in self._clause_order
+        ], dtype=np.float32)
+        self._secondary_w = np.array([
+            self.clause_definitions[c].get('confidence_weights', {}).get('secondary_keyword_match', 0.2)
+            for c in self._clause_order
+        ], dtype=np.float32)
+
+        self._fused_patterns: Dict[str, re.Pattern] = {}
+        self._fused_keyword_map: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        # Aho-Corasick automata (one per kind, shared across clause types):
+        # a single linear DFA scan regardless of keyword count, replacing
+        # the regex alternations when pyahocorasick is installed.
+        self._fused_automata: Dict = {}
+
+        for kind in ('primary_keywords', 'secondary_keywords', 'negative_keywords'):
+            keyword_clauses: Dict[str, List[int]] = {}
+            for idx, clause_type in enumerate(self._clause_order):
+                for keyword in self.clause_definitions[clause_type].get(kind, []):
+                    key = keyword if self.default_case_sensitive else keyword.lower()
+                    keyword_clauses.setdefault(key, []).append(idx)
+
+            if not keyword_clauses:
+                continue
+
+            if AHOCORASICK_AVAILABLE:
+                automaton = ahocorasick.Automaton()
+                for keyword, indices in keyword_clauses.items():
+                    automaton.add_word(keyword, (len(keyword), tuple(indices)))
+                automaton.make_automaton()
+                self._fused_automata[kind] = automaton
+                continue
+
+            # Longest-first so multi-word keywords win over their prefixes.
+            # Keys are already folded, so no IGNORECASE is needed; the
+            # haystack is folded once per segment by the caller.
+            ordered = sorted(keyword_clauses, key=len, reverse=True)
+            alternation = '|'.join(re.escape(keyword) for keyword in ordered)
+            self._fused_patterns[kind] = regex_engine.compile(
+                f'\\b({alternation})\\b'
+            )
+            self._fused_keyword_map[kind] = {
+                keyword: tuple(indices) for keyword, indices in keyword_clauses.items()
+            }
+
+    _KINDS = ('primary_keywords', 'secondary_keywords', 'negative_keywords')
+
+    def _iter_fused_hits(self, text: str):
+        """
+        Yield (kind_index, start_char, end_char, clause_indices) for every
+        fused keyword hit in text. kind_index follows self._KINDS, and
+        end_char is inclusive.
+
+        The caller must pass text already case-folded (lowered) when
+        default_case_sensitive is False; patterns and automata are built
+        from folded keywords without IGNORECASE.
+        """
+        if self._fused_automata:
+            last = len(text) - 1
+            for kind, automaton in self._fused_automata.items():
+                kind_idx = self._KINDS.index(kind)
+                for end_idx, (length, indices) in automaton.iter(text):
+                    # Enforce word-boundary semantics: the automaton matches
+                    # raw substrings, so reject hits flanked by word chars.
+                    start_idx = end_idx - length + 1
+                    if start_idx > 0 and (text[start_idx - 1].isalnum() or text[start_idx - 1] == '_'):
+                        continue
+                    if end_idx < last and (text[end_idx + 1].isalnum() or text[end_idx + 1] == '_'):
+                        continue
+                    yield kind_idx, start_idx, end_idx, indices
+            return
+
+        for kind, pattern in self._fused_patterns.items():
+            kind_idx = self._KINDS.index(kind)
+            keyword_map = self._fused_keyword_map[kind]
+            for match in pattern.finditer(text):
+                indices = keyword_map.get(match.group(0), ())
+                if indices:
+                    yield kind_idx, match.start(), match.end() - 1, indices
+
+    def _count_fused_matches(self, text: str) -> Dict[str, List[int]]:
+        """
+        Scan a segment once per keyword kind and return per-clause hit
+        counts, e.g. {'primary_keywords': [2, 0, 1, 0], ...} following
+        self._clause_order. Same folding contract as _iter_fused_hits.
+        """
+        n_clauses = len(self._clause_order)
+        counts = {kind: [0] * n_clauses for kind in self._KINDS}
+        for kind_idx, _start, _end, indices in self._iter_fused_hits(text):
+            kind_counts = counts[self._KINDS[kind_idx]]
+            for idx in indices:
+                kind_counts[idx] += 1
+        return counts
     
-    def _convert_patterns_to_regex(self, patterns: List[str]) -> List[re.Pattern]:
+    def _convert_patterns_to_regex(self, patterns: List[str]) -> List[Tuple[str, re.Pattern]]:
         """
         Convert text patterns to flexible regex patterns.
-        
+
         Args:
             patterns: List of string patterns
-            
+
         Returns:
-            List of compiled regex patterns
+            List of (original pattern, compiled regex) pairs, so matching
+            never relies on index-parallel lists (which drift when dict
+            entries are interleaved with strings in the config)
         """
         compiled_patterns = []
         
@@ -154,8 +441,9 @@ class ClauseExtractor:
                 continue
                 
             # Convert to a flexible regex pattern:
-            # 1. Escape special regex characters
-            escaped_pattern = re.escape(clean_pattern)
+            # 1. Lowercase (matching is against a folded haystack) and
+            #    escape special regex characters
+            escaped_pattern = re.escape(clean_pattern.lower())
             
             # 2. Make whitespace flexible (match any amount of whitespace)
             flexible_pattern = escaped_pattern.replace("\\ ", "\\s+")
@@ -167,16 +455,15 @@ class ClauseExtractor:
                 flexible_pattern = flexible_pattern + "\\b"
             
             # 4. Make punctuation optional by replacing them with optional groups
-            # This handles variations in punctuation
-            for punct in ["\\.","\\,","\\;","\\:","\\-","\\!"]:
-                flexible_pattern = flexible_pattern.replace(punct, f"{punct}?")
-            
+            # This handles variations in punctuation (one pass over the pattern)
+            flexible_pattern = re.sub(r'(\\[.,;:\-!])', r'\1?', flexible_pattern)
+
             try:
-                # Compile with IGNORECASE and DOTALL flags
-                # IGNORECASE: Match regardless of case
-                # DOTALL: Allow . to match newlines
-                compiled_pattern = re.compile(flexible_pattern, re.IGNORECASE | re.DOTALL)
-                compiled_patterns.append(compiled_pattern)
+                # No flags: literals are folded above and matched against a
+                # folded haystack, and DOTALL bought nothing (no '.' in the
+                # generated patterns) while blocking DFA engines.
+                compiled_pattern = regex_engine.compile(flexible_pattern)
+                compiled_patterns.append((pattern, compiled_pattern))
             except re.error as e:
                 self.logger.warning(f"Failed to compile pattern '{pattern}': {e}")
         
@@ -185,63 +472,63 @@ class ClauseExtractor:
     def match_patterns(self, text: str, clause_name: str) -> List[str]:
         """
         Match text against patterns for a specific clause type.
-        
+        Results are memoized per (text, clause) pair.
+
         Args:
             text: Text to match
             clause_name: Name of the clause to match patterns for
-            
+
         Returns:
             List of matched pattern strings
         """
         if not text or not clause_name or clause_name not in self.clause_definitions:
             return []
-        
+        return list(self._match_patterns_cached(text, clause_name))
+
+    def _match_patterns_uncached(self, text: str, clause_name: str) -> Tuple[str, ...]:
+        """Uncached matching body; called through self._match_patterns_cached."""
         # Get the clause definition
         definition = self.clause_definitions[clause_name]
-        
+
+        # Converted patterns were historically IGNORECASE; they now carry
+        # folded literals and match against a folded haystack instead.
+        scan = text.lower()
+
         # Get the regex patterns for this clause
         regex_patterns = definition.get("regex_patterns", [])
-        
-        # Also check for structured pattern objects
-        structured_patterns = definition.get("patterns", [])
-        if structured_patterns and isinstance(structured_patterns, list):
-            for pattern_obj in structured_patterns:
-                if isinstance(pattern_obj, dict) and "regex" in pattern_obj:
-                    try:
-                        # Use the regex directly from the pattern object
-                        pattern_regex = pattern_obj["regex"]
-                        compiled_pattern = re.compile(pattern_regex, re.IGNORECASE)
-                        if compiled_pattern.search(text):
-                            return [pattern_regex]  # Return immediately if we find a match
-                    except re.error as e:
-                        self.logger.warning(f"Invalid regex in pattern object: {e}")
-        
-        # Match against the converted patterns
-        matched_patterns = []
-        original_patterns = definition.get("patterns", [])
-        
-        for i, pattern in enumerate(regex_patterns):
-            if pattern.search(text):
-                # Add the original pattern to the matched list
-                if i < len(original_patterns):
-                    matched_patterns.append(original_patterns[i])
-                
-        return matched_patterns
+
+        # Also check for structured pattern objects (precompiled at setup)
+        for pattern_regex, compiled_pattern in definition.get("_structured_compiled", []):
+            if compiled_pattern.search(scan):
+                return (pattern_regex,)  # Return immediately if we find a match
+
+        # Match against the converted patterns; each entry carries its own
+        # source string, so no index-parallel lookup into "patterns".
+        return tuple(
+            original
+            for original, compiled in regex_patterns
+            if compiled.search(scan)
+        )
     
     def _preprocess_text(self, text: str) -> str:
-        """Apply basic text preprocessing."""
+        """Apply basic text preprocessing (cached on the input text)."""
         if not text:
             return ""
-        
+        return self._preprocess_cached(text)
+
+    def _preprocess_uncached(self, text: str) -> str:
+        """Uncached preprocessing body; called through self._preprocess_cached."""
         # Remove extra whitespace
-        processed_text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Normalize quotes and dashes
-        processed_text = processed_text.replace('"', '"').replace('"', '"')
-        processed_text = processed_text.replace(''', "'").replace(''', "'")
-        processed_text = processed_text.replace('–', '-').replace('—', '-')
-        
-        return processed_text
+        collapsed = self._ws_re.sub(' ', text.strip())
+
+        # Pure-ASCII text (the common case) cannot contain the smart
+        # quotes/dashes the table normalizes; isascii() is one C-level
+        # byte scan, far cheaper than the translation pass.
+        if collapsed.isascii():
+            return collapsed
+
+        # Normalize quotes and dashes in one C-level pass
+        return collapsed.translate(self._normalize_tbl)
     
     def get_clause_types(self) -> List[str]:
         """Get a list of all available clause types."""
@@ -252,252 +539,404 @@ class ClauseExtractor:
         return self.clause_definitions.get(clause_type)
     
     def segment_text(
-        self, 
-        text: str, 
-        use_sliding_window: bool = True, 
+        self,
+        text: str,
+        use_sliding_window: bool = True,
         max_window_size: int = 3
     ) -> List[Dict]:
         """
         Segment text into sentences and create sliding windows.
-        
+
         Args:
             text: Input text to segment
             use_sliding_window: Whether to create sliding windows of sentences
             max_window_size: Maximum number of sentences in a window (1-3)
-            
+
         Returns:
             List of segment dictionaries with segment_id, start_index, end_index, text
         """
-        if not text or not text.strip():
+        segments = self._build_segments(text, use_sliding_window, max_window_size)
+        if segments is None:
             return []
-        
+        return [
+            {
+                "segment_id": int(seg_id),
+                "start_index": int(start),
+                "end_index": int(end),
+                "text": seg_text,
+            }
+            for seg_id, start, end, seg_text in zip(
+                segments.ids, segments.start, segments.end, segments.texts
+            )
+        ]
+
+    def _iter_segments(
+        self,
+        text: str,
+        use_sliding_window: bool = True,
+        max_window_size: int = 3,
+    ):
+        """
+        Lazily yield (start_index, end_index, text) segment tuples.
+
+        Only the current window size's strings are alive at any point
+        (O(W) beyond the sentence list), so consumers that process one
+        segment at a time never hold every window in memory.
+        """
+        if not text or not text.strip():
+            return
+
         # Split text into sentences
         sentences = self._split_into_sentences(text)
-        
+
         if not sentences:
-            return []
-        
-        # Generate segments
-        segments = []
-        segment_id = 0
-        
+            return
+
         if use_sliding_window:
             # Create sliding windows
             max_window_size = max(1, min(max_window_size, 3))  # Clamp to 1-3
-            
+
+            # Build each window from the size-below window at the same start
+            # index, so no sentence prefix is ever re-joined from scratch.
+            previous_windows = list(sentences)
             for window_size in range(1, max_window_size + 1):
-                for start_idx in range(len(sentences) - window_size + 1):
-                    end_idx = start_idx + window_size - 1
-                    
-                    # Combine sentences in the window
-                    window_text = ' '.join(sentences[start_idx:end_idx + 1])
-                    
-                    segments.append({
-                        "segment_id": segment_id,
-                        "start_index": start_idx,
-                        "end_index": end_idx,
-                        "text": window_text.strip()
-                    })
-                    segment_id += 1
+                if window_size > 1:
+                    previous_windows = [
+                        previous_windows[i] + ' ' + sentences[i + window_size - 1]
+                        for i in range(len(sentences) - window_size + 1)
+                    ]
+                for start_idx, window_text in enumerate(previous_windows):
+                    yield start_idx, start_idx + window_size - 1, window_text.strip()
         else:
             # Single sentence segments only
             for idx, sentence in enumerate(sentences):
-                segments.append({
-                    "segment_id": segment_id,
-                    "start_index": idx,
-                    "end_index": idx,
-                    "text": sentence.strip()
-                })
-                segment_id += 1
-        
-        self.logger.debug(f"Created {len(segments)} text segments from {len(sentences)} sentences")
-        return segments
+                yield idx, idx, sentence.strip()
+
+    def _build_segments(
+        self,
+        text: str,
+        use_sliding_window: bool = True,
+        max_window_size: int = 3,
+    ) -> Optional[SimpleNamespace]:
+        """
+        Struct-of-arrays segment construction: parallel int32 arrays for
+        ids/start/end plus a text list, instead of one dict per segment.
+        The batched scorer needs every segment text anyway (for pattern
+        and context boosts), so it consumes the streaming iterator into
+        this form; one-at-a-time consumers can use _iter_segments direct.
+        """
+        texts: List[str] = []
+        starts: List[int] = []
+        ends: List[int] = []
+
+        for start_idx, end_idx, segment_text in self._iter_segments(
+            text, use_sliding_window, max_window_size
+        ):
+            texts.append(segment_text)
+            starts.append(start_idx)
+            ends.append(end_idx)
+
+        if not texts:
+            return None
+
+        self.logger.debug(f"Created {len(texts)} text segments")
+        return SimpleNamespace(
+            ids=np.arange(len(texts), dtype=np.int32),
+            start=np.array(starts, dtype=np.int32),
+            end=np.array(ends, dtype=np.int32),
+            texts=texts,
+        )
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
         Split text into sentences using NLTK or regex fallback.
-        
+        Results are cached per input text.
+
         Args:
             text: Input text to split
-            
+
         Returns:
             List of sentence strings
         """
         text = text.strip()
         if not text:
             return []
-        
+
+        self._initialize_nltk()
+        return list(self._sentences_cached(text))
+
+    def _split_uncached(self, text: str) -> Tuple[str, ...]:
+        """Uncached split body; called through self._sentences_cached."""
         # Use NLTK if available
         if NLTK_AVAILABLE:
             try:
-                sentences = sent_tokenize(text)
+                tokenize = self._punkt.tokenize if self._punkt else sent_tokenize
+                sentences = tokenize(text)
                 # Filter out very short sentences (likely artifacts)
-                sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
-                return sentences
+                return tuple(s.strip() for s in sentences if len(s.strip()) > 10)
             except Exception as e:
                 self.logger.warning(f"NLTK sentence splitting failed: {e}, falling back to regex")
-        
+
         # Regex-based fallback
-        return self._regex_sentence_split(text)
+        return tuple(self._regex_sentence_split(text))
     
     def _regex_sentence_split(self, text: str) -> List[str]:
         """
-        Split text into sentences using regex patterns.
-        
+        Split text into sentences using a precompiled boundary scan.
+
+        A single pass of self._sentence_boundary_re (abbreviation-guarded
+        end punctuation followed by a capitalized word) replaces the old
+        split/recombine loop that ran several regex searches per sentence.
+
         Args:
             text: Input text to split
-            
+
         Returns:
             List of sentence strings
         """
-        # Sentence boundary patterns
-        sentence_endings = r'[.!?]+'
-        
-        # Abbreviation patterns to avoid splitting on
-        abbreviations = r'\b(?:Mr|Mrs|Ms|Dr|Prof|Corp|Inc|Ltd|Co|vs|etc|al|Jr|Sr|Ph\.D|M\.D|B\.A|M\.A)\.'
-        
-        # Split on sentence endings, but preserve the ending punctuation
-        sentences = re.split(f'({sentence_endings})', text)
-        
-        # Recombine sentences with their punctuation
-        combined_sentences = []
-        for i in range(0, len(sentences) - 1, 2):
-            sentence = sentences[i].strip()
-            if i + 1 < len(sentences):
-                sentence += sentences[i + 1]
-            
-            # Check if this looks like an abbreviation
-            if re.search(abbreviations, sentence) and len(sentence) < 50:
-                # Likely an abbreviation, combine with next sentence
-                if combined_sentences:
-                    combined_sentences[-1] += ' ' + sentence
-                else:
-                    combined_sentences.append(sentence)
-            else:
-                combined_sentences.append(sentence)
-        
-        # Handle the last element if odd number of splits
-        if len(sentences) % 2 == 1:
-            last_sentence = sentences[-1].strip()
-            if last_sentence:
-                if combined_sentences:
-                    combined_sentences[-1] += ' ' + last_sentence
-                else:
-                    combined_sentences.append(last_sentence)
-        
-        # Filter and clean sentences
-        final_sentences = []
-        for sentence in combined_sentences:
-            sentence = sentence.strip()
-            # Filter out very short sentences and clean up whitespace
-            if len(sentence) > 10:
-                sentence = re.sub(r'\s+', ' ', sentence)
-                final_sentences.append(sentence)
-        
-        return final_sentences
+        parts = self._sentence_boundary_re.split(text)
+        return [
+            self._ws_re.sub(' ', part).strip()
+            for part in parts
+            if len(part.strip()) > 10
+        ]
     
-    def extract_clauses(self, text: str) -> List[Dict]:
+    def extract_clauses(self, text: str, top_k: Optional[int] = None) -> List[Dict]:
         """
         Extract clauses from the given text using keyword matching and confidence scoring.
-        
+        Results are memoized by content hash, so retries and re-uploads of
+        identical text cost one dict lookup.
+
         Args:
             text: The contract text to analyze
-            
+            top_k: When given, return only the top_k highest-confidence
+                clauses via a partial sort instead of sorting everything
+
         Returns:
-            List of dictionaries containing clause information
+            List of dictionaries containing clause information, highest
+            confidence first
         """
         if not text or not text.strip():
             return []
-        
+
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        clauses = self._extract_cache.get(key)
+        if clauses is None:
+            clauses = self._extract_clauses_uncached(text)
+            if len(self._extract_cache) >= self._EXTRACT_CACHE_MAX:
+                self._extract_cache.clear()
+            self._extract_cache[key] = clauses
+
+        # Hand out copies so callers can't mutate the cached entries
+        clauses = [dict(clause) for clause in clauses]
+
+        if top_k is not None:
+            # O(M log K) partial sort when only the best few are consumed
+            return heapq.nlargest(top_k, clauses, key=lambda x: x["confidence"])
+        return clauses
+
+    _EXTRACT_CACHE_MAX = 256
+
+    def _extract_clauses_uncached(self, text: str) -> List[Dict]:
+        """Full extraction body; called through the content-hash cache."""
         # Preprocess the text
         preprocessed_text = self._preprocess_text(text)
-        
-        # Segment the text into sentence windows
-        segments = self.segment_text(preprocessed_text)
-        
-        if not segments:
+
+        sentences = self._split_into_sentences(preprocessed_text)
+        if not sentences:
             return []
-        
+
+        n_sentences = len(sentences)
+        max_window_size = 3
+        window_sizes = [
+            w for w in range(1, max_window_size + 1) if n_sentences - w + 1 > 0
+        ]
+
+        # Join the document ONCE. Any window [i, j] is exactly
+        # joined[offsets[i]:offsets[j+1] - 1], so window texts become
+        # slices and the fused keyword scan runs a single pass over the
+        # whole document instead of once per window.
+        joined = ' '.join(sentences)
+        offsets = np.zeros(n_sentences + 1, dtype=np.int64)
+        pos = 0
+        for i, sentence in enumerate(sentences):
+            offsets[i] = pos
+            pos += len(sentence) + 1
+        offsets[n_sentences] = pos
+
+        # Fold the document once; patterns are compiled from folded
+        # literals, so no per-call IGNORECASE casefolding is paid.
+        scan_joined = joined.lower() if self._ci else joined
+
+        # Segment bookkeeping mirrors _iter_segments ordering: all windows
+        # of size 1, then size 2, then size 3.
+        seg_base = {}
+        starts: List[int] = []
+        ends: List[int] = []
+        for w in window_sizes:
+            seg_base[w] = len(starts)
+            for start_idx in range(n_sentences - w + 1):
+                starts.append(start_idx)
+                ends.append(start_idx + w - 1)
+        n_segments = len(starts)
+
+        n_clauses = len(self._clause_order)
+        counts = np.zeros((n_segments, 3, n_clauses), dtype=np.float32)
+
+        # Map each document-level hit back to its sentence span via the
+        # offsets array and credit every window containing that span.
+        for kind_idx, start_char, end_char, clause_indices in self._iter_fused_hits(scan_joined):
+            a = int(np.searchsorted(offsets, start_char, side='right')) - 1
+            b = int(np.searchsorted(offsets, end_char, side='right')) - 1
+            for w in window_sizes:
+                lo = max(b - w + 1, 0)
+                hi = min(a, n_sentences - w)
+                if lo > hi:
+                    continue
+                base_idx = seg_base[w]
+                for start_idx in range(lo, hi + 1):
+                    for idx in clause_indices:
+                        counts[base_idx + start_idx, kind_idx, idx] += 1
+
+        base_scores = _score_keyword_base(counts, self._primary_w, self._secondary_w)
+
         # Extract clauses from each segment
         extracted_clauses = []
-        
-        for segment in segments:
-            segment_text = segment["text"]
-            segment_id = segment["segment_id"]
-            
+
+        for s in range(n_segments):
+            lo_char = offsets[starts[s]]
+            hi_char = offsets[ends[s] + 1] - 1
+            segment_text = joined[lo_char:hi_char]
+            scan_text = scan_joined[lo_char:hi_char] if self._ci else segment_text
+
             # Check each clause type against the segment
-            for clause_type, definition in self.clause_definitions.items():
-                confidence = self._calculate_confidence(segment_text, clause_type, definition)
-                
+            for idx, (clause_type, definition) in enumerate(self.clause_definitions.items()):
+                base = base_scores[s, idx]
+                if base < 0.0:
+                    # Rejected by a negative keyword
+                    continue
+
+                confidence = self._finalize_confidence(
+                    segment_text, clause_type, definition,
+                    float(base), counts[s, 0, idx] > 0,
+                    scan_text=scan_text
+                )
+
                 # Check if confidence meets minimum threshold
-                min_threshold = definition.get("minimum_confidence_threshold", 
+                min_threshold = definition.get("minimum_confidence_threshold",
                                              self.global_config.get("default_confidence_threshold", 0.5))
-                
+
                 if confidence >= min_threshold:
                     extracted_clauses.append({
                         "clause_type": clause_type,
-                        "segment_id": segment_id,
+                        "segment_id": s,
                         "text": segment_text,
                         "confidence": confidence
                     })
-        
+
+        self.logger.debug(f"Extracted {len(extracted_clauses)} clauses from {n_segments} segments")
+
         # Sort by confidence (highest first)
         extracted_clauses.sort(key=lambda x: x["confidence"], reverse=True)
-        
-        self.logger.debug(f"Extracted {len(extracted_clauses)} clauses from {len(segments)} segments")
-        
         return extracted_clauses
     
-    def _calculate_confidence(self, text: str, clause_type: str, definition: Dict) -> float:
+    def _calculate_confidence(
+        self,
+        text: str,
+        clause_type: str,
+        definition: Dict,
+        keyword_counts: Optional[Tuple[int, int, int]] = None,
+    ) -> float:
         """
         Calculate confidence score for a text segment matching a clause type.
-        
+
         Args:
             text: The text segment to analyze
             clause_type: The type of clause being matched
             definition: The clause definition dictionary
-            
+            keyword_counts: Optional (primary, secondary, negative) hit
+                counts from the fused scan; computed with the per-clause
+                patterns when absent
+
         Returns:
             Confidence score between 0.0 and 1.0
         """
         if not text:
             return 0.0
-        
-        # Get compiled patterns for this clause type
-        patterns = self.compiled_patterns.get(clause_type, {})
-        
+
+        scan = None
+        if keyword_counts is not None:
+            primary_matches, secondary_matches, negative_matches = keyword_counts
+        else:
+            # Standalone call: fall back to the per-clause compiled patterns.
+            # Ordered cheapest-rejection-first so the common case — a clause
+            # type that simply does not apply — exits after one search.
+            patterns = self.compiled_patterns.get(clause_type, {})
+            scan = text.lower() if patterns.get('_fold') else text
+            negative_pattern = patterns.get("negative")
+            if negative_pattern and negative_pattern.search(scan):
+                self.logger.debug(f"Negative keyword found in {clause_type}, rejecting")
+                return 0.0
+            negative_matches = 0
+
+            # Count in a single finditer pass; search-then-findall would
+            # scan the text twice and findall allocates the match strings.
+            primary_pattern = patterns.get("primary")
+            primary_matches = sum(1 for _ in primary_pattern.finditer(scan)) if primary_pattern else 0
+            if not primary_matches and not self.match_patterns(text, clause_type):
+                # Neither primary keywords nor patterns match; nothing the
+                # secondary/context boosts could do would qualify this cell.
+                return 0.0
+
+            secondary_pattern = patterns.get("secondary")
+            secondary_matches = sum(1 for _ in secondary_pattern.finditer(scan)) if secondary_pattern else 0
+
         # Check for negative keywords first
-        negative_pattern = patterns.get("negative")
-        if negative_pattern and negative_pattern.search(text):
+        if negative_matches:
             self.logger.debug(f"Negative keyword found in {clause_type}, rejecting")
             return 0.0
-        
-        # Track if we have any matches at all
-        has_primary_match = False
-        has_pattern_match = False
-        
+
         # Calculate confidence based on keyword matches
         confidence_weights = definition.get("confidence_weights", {})
         total_confidence = 0.0
-        
+
         # Primary keyword match
-        primary_pattern = patterns.get("primary")
         primary_weight = confidence_weights.get("primary_keyword_match", 0.4)
-        
-        if primary_pattern and primary_pattern.search(text):
-            primary_matches = len(primary_pattern.findall(text))
-            primary_score = min(1.0, primary_matches * primary_weight)
-            total_confidence += primary_score
-            has_primary_match = True
-        
+
+        if primary_matches:
+            total_confidence += min(1.0, primary_matches * primary_weight)
+
         # Secondary keyword match (optional boost)
-        secondary_pattern = patterns.get("secondary")
-        if secondary_pattern:
+        if secondary_matches:
             secondary_weight = confidence_weights.get("secondary_keyword_match", 0.2)
-            secondary_matches = len(secondary_pattern.findall(text))
-            secondary_score = min(1.0, secondary_matches * secondary_weight)
-            total_confidence += secondary_score
-        
+            total_confidence += min(1.0, secondary_matches * secondary_weight)
+
+        return self._finalize_confidence(
+            text, clause_type, definition, total_confidence, primary_matches > 0,
+            scan_text=scan
+        )
+
+    def _finalize_confidence(
+        self,
+        text: str,
+        clause_type: str,
+        definition: Dict,
+        total_confidence: float,
+        has_primary_match: bool,
+        scan_text: Optional[str] = None,
+    ) -> float:
+        """
+        Add pattern and context-clue boosts to a base keyword score and
+        apply the has-any-match rule and clamping. Shared between the
+        batched extract_clauses path (which scores keywords via the
+        kernel) and standalone _calculate_confidence calls.
+
+        scan_text, when given, is the already case-folded form of text so
+        folding is not repeated per (segment, clause) cell.
+        """
+        has_pattern_match = False
+        confidence_weights = definition.get("confidence_weights", {})
+
         # Pattern matching from string patterns
         pattern_weight = confidence_weights.get("pattern_match", 0.25)
         pattern_boost_per_match = 0.2  # Boost per matched pattern
@@ -512,33 +951,28 @@ class ClauseExtractor:
             total_confidence += pattern_score
             
             self.logger.debug(f"Matched patterns for {clause_type}: {matched_patterns}")
-        
-        # Context clues (optional boost)
-        context_clues = definition.get("context_clues", [])
-        if context_clues:
+
+        # No primary keywords and no patterns: the segment cannot qualify,
+        # so skip the context-clue scan entirely.
+        if not has_primary_match and not has_pattern_match:
+            return 0.0
+
+        # Context clues (optional boost); precompiled at setup alongside
+        # the keyword patterns, so this is a single counting pass.
+        patterns = self.compiled_patterns.get(clause_type, {})
+        context_pattern = patterns.get("context")
+        if context_pattern:
+            if not patterns.get('_fold'):
+                scan = text
+            else:
+                scan = scan_text if scan_text is not None else text.lower()
             context_weight = confidence_weights.get("context_clue_match", 0.1)
-            context_matches = 0
-            
-            for clue in context_clues:
-                case_sensitive = definition.get("case_sensitive", self.default_case_sensitive)
-                flags = 0 if case_sensitive else re.IGNORECASE
-                
-                try:
-                    clue_pattern = re.compile(r'\b' + re.escape(clue) + r'\b', flags)
-                    if clue_pattern.search(text):
-                        context_matches += 1
-                except re.error:
-                    pass
-            
+            context_matches = sum(1 for _ in context_pattern.finditer(scan))
+
             if context_matches > 0:
                 context_score = min(1.0, context_matches * context_weight)
                 total_confidence += context_score
-        
-        # Check if we have any match at all
-        if not has_primary_match and not has_pattern_match:
-            # Neither primary keywords nor patterns matched
-            return 0.0
-        
+
         # Normalize confidence to be between 0.0 and 1.0
         total_confidence = min(1.0, max(0.0, total_confidence))
         
@@ -547,29 +981,45 @@ class ClauseExtractor:
         return total_confidence
     
     def _compile_patterns_for_clause(self, clause_type: str, definition: Dict) -> None:
-        """Compile regex patterns for a specific clause type."""
+        """
+        Compile regex patterns for a specific clause type.
+
+        Case-insensitive clauses fold their literals at compile time and
+        are matched against a pre-lowered haystack (patterns['_fold']
+        tells the scorer to fold), avoiding IGNORECASE's per-position
+        casefolding in the regex engine.
+        """
         case_sensitive = definition.get('case_sensitive', self.default_case_sensitive)
-        flags = 0 if case_sensitive else re.IGNORECASE
-        
-        patterns = {}
-        
+        fold = not case_sensitive
+
+        patterns = {'_fold': fold}
+
+        def _escape(keyword: str) -> str:
+            return re.escape(keyword.lower() if fold else keyword)
+
         # Compile primary keyword patterns
         primary_keywords = definition.get('primary_keywords', [])
         if primary_keywords:
-            primary_pattern = '|'.join(re.escape(keyword) for keyword in primary_keywords)
-            patterns['primary'] = re.compile(f'\\b({primary_pattern})\\b', flags)
-        
+            primary_pattern = '|'.join(_escape(keyword) for keyword in primary_keywords)
+            patterns['primary'] = regex_engine.compile(f'\\b({primary_pattern})\\b')
+
         # Compile secondary keyword patterns
         secondary_keywords = definition.get('secondary_keywords', [])
         if secondary_keywords:
-            secondary_pattern = '|'.join(re.escape(keyword) for keyword in secondary_keywords)
-            patterns['secondary'] = re.compile(f'\\b({secondary_pattern})\\b', flags)
-        
+            secondary_pattern = '|'.join(_escape(keyword) for keyword in secondary_keywords)
+            patterns['secondary'] = regex_engine.compile(f'\\b({secondary_pattern})\\b')
+
         # Compile negative keyword patterns
         negative_keywords = definition.get('negative_keywords', [])
         if negative_keywords:
-            negative_pattern = '|'.join(re.escape(keyword) for keyword in negative_keywords)
-            patterns['negative'] = re.compile(f'\\b({negative_pattern})\\b', flags)
-        
+            negative_pattern = '|'.join(_escape(keyword) for keyword in negative_keywords)
+            patterns['negative'] = regex_engine.compile(f'\\b({negative_pattern})\\b')
+
+        # Compile context clue patterns (same shape as the keyword kinds)
+        context_clues = definition.get('context_clues', [])
+        if context_clues:
+            context_pattern = '|'.join(_escape(clue) for clue in context_clues)
+            patterns['context'] = regex_engine.compile(f'\\b(?:{context_pattern})\\b')
+
         self.compiled_patterns[clause_type] = patterns
         self.logger.debug(f"Compiled patterns for clause type: {clause_type}")
\ No newline at end of file
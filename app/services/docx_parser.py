@@ -1,19 +1,42 @@
-import io
-from typing import Optional
+import asyncio
+import logging
+import zipfile
+from typing import BinaryIO, Optional
 
-from docx import Document
+from lxml import etree
 
+logger = logging.getLogger(__name__)
 
-async def parse_docx(file_content: bytes) -> Optional[str]:
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_P_TAG = f"{{{_W_NS}}}p"
+_T_TAG = f"{{{_W_NS}}}t"
+
+
+async def parse_docx(file_obj: BinaryIO) -> Optional[str]:
+    """
+    Extract text from a DOCX file object.
+
+    The ZIP + XML work is synchronous and CPU-bound, so it runs on a
+    worker thread; the event loop keeps serving other uploads while a
+    large contract is parsed.
+    """
+    return await asyncio.to_thread(_parse_docx_sync, file_obj)
+
+
+def _parse_docx_sync(file_obj: BinaryIO) -> Optional[str]:
     """
-    Extract text from a DOCX file using python-docx.
+    Streams word/document.xml with lxml iterparse instead of building the
+    full python-docx DOM: each paragraph subtree is read, its text nodes
+    joined, and the element freed, so peak memory stays at one paragraph
+    regardless of document size.
     """
     try:
-        doc = Document(io.BytesIO(file_content))
-        text = []
-        for paragraph in doc.paragraphs:
-            text.append(paragraph.text)
-        return "\n".join(text).strip()
-    except Exception as e:
-        print(f"Error parsing DOCX: {str(e)}")
-        return None
\ No newline at end of file
+        texts = []
+        with zipfile.ZipFile(file_obj) as archive, archive.open("word/document.xml") as document:
+            for _event, paragraph in etree.iterparse(document, tag=_P_TAG):
+                texts.append("".join(t.text or "" for t in paragraph.iter(_T_TAG)))
+                paragraph.clear()
+        return "\n".join(texts).strip()
+    except Exception:
+        logger.exception("Error parsing DOCX")
+        return None
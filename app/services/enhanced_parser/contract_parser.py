@@ -1,5 +1,6 @@
+import asyncio
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from pathlib import Path
 
 from .document_parser import DocumentParser
@@ -109,34 +110,56 @@ class ContractParser:
                 return result
             
             # Store results from parsing
-            result['raw_text'] = parsing_result['text']
+            raw_text = parsing_result['text']
+            result['raw_text'] = raw_text
             result['metadata'] = parsing_result['metadata']
             result['processing_info']['format'] = parsing_result['format']
-            
+
             # Step 2: Preprocess the text
-            cleaned_text = self.preprocessor.clean_text(parsing_result['text'])
+            cleaned_text = self.preprocessor.clean_text(raw_text)
             result['cleaned_text'] = cleaned_text
-            
+
             # Step 3: Detect sections
             sections = self.section_detector.detect_sections(cleaned_text)
             result['sections'] = sections
-            
+
             # Step 4: Add processing statistics
             result['processing_info'].update({
-                'raw_text_length': len(result['raw_text']),
-                'cleaned_text_length': len(result['cleaned_text']),
+                'raw_text_length': len(raw_text),
+                'cleaned_text_length': len(cleaned_text),
                 'sections_detected': len(sections),
                 'processing_method': 'enhanced_parser'
             })
-            
+
             result['success'] = True
-            
+
         except Exception as e:
             result['errors'].append(f"Error processing contract: {str(e)}")
             result['success'] = False
-        
+
         return result
-    
+
+    async def process_contracts_bulk(
+        self, files: Sequence[Tuple[bytes, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several uploaded contracts concurrently.
+
+        Each (file_content, filename) pair runs process_contract_bytes on
+        a worker thread; the batch completes in roughly the time of the
+        slowest document rather than the sum of all of them.
+
+        Args:
+            files: Sequence of (file_content, filename) pairs
+
+        Returns:
+            Parsing results in the same order as the input
+        """
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(self.process_contract_bytes, content, name)
+            for content, name in files
+        )))
+
     def get_section_by_type(self, sections: List[Dict[str, Any]], section_type: str) -> Optional[Dict[str, Any]]:
         """
         Find a specific section by its type.
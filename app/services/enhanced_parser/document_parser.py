@@ -1,5 +1,7 @@
+import hashlib
 import os
 import mimetypes
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
 
@@ -9,12 +11,37 @@ from .txt_parser import TXTParser
 from .text_preprocessor import TextPreprocessor
 from .section_detector import SectionDetector
 
+# One parser per worker process for parse_many: parser instances hold
+# backend state that doesn't pickle, so each worker lazily builds its own
+# and reuses it across tasks.
+_WORKER_PARSER: Optional["DocumentParser"] = None
+
+
+def _parse_one(file_path: str) -> Dict[str, Any]:
+    """Worker-side entry point for DocumentParser.parse_many."""
+    global _WORKER_PARSER
+    if _WORKER_PARSER is None:
+        _WORKER_PARSER = DocumentParser()
+    return _WORKER_PARSER.parse(file_path)
+
 
 class DocumentParser:
     """
     Unified document parser that handles multiple file formats with a single interface.
     """
     
+    # Parsed-result cache bound; cleared wholesale at the cap like the
+    # other in-process caches in this app
+    _CACHE_MAX = 128
+
+    # Extension -> format table, shared by detection and support checks
+    _FORMAT_MAP = {
+        '.pdf': 'pdf',
+        '.docx': 'docx',
+        '.txt': 'txt'
+    }
+    _SUPPORTED_EXTENSIONS = frozenset(_FORMAT_MAP)
+
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.txt']
         self.format_parsers = {
@@ -24,29 +51,44 @@ class DocumentParser:
         }
         self.preprocessor = TextPreprocessor()
         self.section_detector = SectionDetector()
-    
+        # Successful parse results keyed by (path, mtime, size) for
+        # files and a content digest for uploaded bytes
+        self._result_cache: Dict[Any, Dict[str, Any]] = {}
+
+    def clear_cache(self) -> None:
+        """Drop all memoized parse results."""
+        self._result_cache.clear()
+
+    def _cache_get(self, key) -> Optional[Dict[str, Any]]:
+        cached = self._result_cache.get(key)
+        # Shallow copy so callers can't mutate the cached entry
+        return dict(cached) if cached is not None else None
+
+    def _cache_put(self, key, result: Dict[str, Any]) -> None:
+        # Failures are cheap to reproduce and may be transient; don't
+        # pin them in the cache
+        if not result['success']:
+            return
+        if len(self._result_cache) >= self._CACHE_MAX:
+            self._result_cache.clear()
+        self._result_cache[key] = dict(result)
+
+
     def is_supported(self, file_path: str) -> bool:
         """Check if the file format is supported."""
         _, ext = os.path.splitext(file_path.lower())
-        return ext in self.supported_formats
-    
+        return ext in self._SUPPORTED_EXTENSIONS
+
     def _detect_format(self, file_path: str) -> str:
         """Auto-detect file format from extension and MIME type."""
         _, ext = os.path.splitext(file_path.lower())
-        
-        # Verify with MIME type as backup
-        mime_type, _ = mimetypes.guess_type(file_path)
-        
-        format_mapping = {
-            '.pdf': 'pdf',
-            '.docx': 'docx',
-            '.txt': 'txt'
-        }
-        
-        if ext in format_mapping:
-            return format_mapping[ext]
-        
+
+        # A known extension settles it; don't touch the MIME database
+        if ext in self._FORMAT_MAP:
+            return self._FORMAT_MAP[ext]
+
         # Fallback to MIME type detection
+        mime_type, _ = mimetypes.guess_type(file_path)
         if mime_type:
             if 'pdf' in mime_type:
                 return 'pdf'
@@ -60,7 +102,7 @@ class DocumentParser:
     def parse(self, file_path: str) -> Dict[str, Any]:
         """
         Parse document with auto-format detection.
-        
+
         Returns:
             Dict containing:
             - text: str (extracted text)
@@ -70,7 +112,29 @@ class DocumentParser:
             - success: bool
             - errors: list (any errors encountered)
         """
-        result = {
+        # (path, mtime, size) is a cheap stand-in for hashing the file;
+        # an unchanged file on disk reuses the previous result
+        try:
+            stat = os.stat(file_path)
+            cache_key = ('path', file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._parse_uncached(file_path)
+
+        if cache_key is not None:
+            self._cache_put(cache_key, result)
+        return result
+
+    @staticmethod
+    def _new_result() -> Dict[str, Any]:
+        """Empty result skeleton shared by both parse entry points."""
+        return {
             'text': '',
             'metadata': {},
             'sections': [],
@@ -78,104 +142,97 @@ class DocumentParser:
             'success': False,
             'errors': []
         }
-        
+
+    def _finalize(self, result: Dict[str, Any], parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the shared preprocess -> section-detection tail."""
+        if not parsed_data['success']:
+            result['errors'].extend(parsed_data.get('errors', []))
+            return result
+
+        result['metadata'] = parsed_data.get('metadata', {})
+
+        cleaned_text = self.preprocessor.clean_text(parsed_data['text'])
+        result['text'] = cleaned_text
+        result['sections'] = self.section_detector.detect_sections(cleaned_text)
+        result['success'] = True
+        return result
+
+    def _parse_uncached(self, file_path: str) -> Dict[str, Any]:
+        result = self._new_result()
+
         try:
             # Validate file exists
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
-            
+
             # Check if supported
             if not self.is_supported(file_path):
                 raise ValueError(f"Unsupported file format: {file_path}")
-            
+
             # Detect format
             format_type = self._detect_format(file_path)
             result['format'] = format_type
-            
-            # Get appropriate parser
-            ext = '.' + format_type
-            parser = self.format_parsers[ext]
-            
-            # Parse document
-            parsed_data = parser.parse(file_path)
-            
-            if not parsed_data['success']:
-                result['errors'].extend(parsed_data.get('errors', []))
-                return result
-            
-            # Extract raw text and metadata
-            raw_text = parsed_data['text']
-            result['metadata'] = parsed_data.get('metadata', {})
-            
-            # Preprocess text
-            cleaned_text = self.preprocessor.clean_text(raw_text)
-            result['text'] = cleaned_text
-            
-            # Detect sections
-            sections = self.section_detector.detect_sections(cleaned_text)
-            result['sections'] = sections
-            
-            result['success'] = True
-            
+
+            # Parse and run the shared pipeline tail
+            parser = self.format_parsers['.' + format_type]
+            return self._finalize(result, parser.parse(file_path))
+
         except Exception as e:
             result['errors'].append(f"Error parsing document: {str(e)}")
             result['success'] = False
-        
+
         return result
     
+    def parse_many(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parse a batch of documents across worker processes.
+
+        PDF/DOCX extraction is CPU-bound, so a batch parsed in-process
+        serializes on one core; fanning out over a ProcessPoolExecutor
+        scales with the machine instead. Results come back in input
+        order. Single-item batches skip the pool entirely.
+
+        Args:
+            file_paths: Paths of the documents to parse
+            max_workers: Worker process cap (defaults to the CPU count)
+        """
+        if len(file_paths) <= 1:
+            return [self.parse(file_path) for file_path in file_paths]
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(_parse_one, file_paths))
+
     def parse_bytes(self, file_content: bytes, filename: str) -> Dict[str, Any]:
         """
         Parse document from bytes content.
         Useful for uploaded files without saving to disk.
         """
-        result = {
-            'text': '',
-            'metadata': {},
-            'sections': [],
-            'format': '',
-            'success': False,
-            'errors': []
-        }
-        
+        _, ext = os.path.splitext(filename.lower())
+        cache_key = ('bytes', ext, hashlib.blake2b(file_content, digest_size=16).digest())
+
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._parse_bytes_uncached(file_content, filename)
+        self._cache_put(cache_key, result)
+        return result
+
+    def _parse_bytes_uncached(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        result = self._new_result()
+
         try:
             # Detect format from filename
             format_type = self._detect_format(filename)
             result['format'] = format_type
-            
-            # Get appropriate parser
-            ext = '.' + format_type
-            parser = self.format_parsers[ext]
-            
-            # Parse from bytes if parser supports it
-            if hasattr(parser, 'parse_bytes'):
-                parsed_data = parser.parse_bytes(file_content)
-            else:
-                # Save temporarily and parse
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp_file:
-                    tmp_file.write(file_content)
-                    tmp_file.flush()
-                    parsed_data = parser.parse(tmp_file.name)
-                    os.unlink(tmp_file.name)
-            
-            if not parsed_data['success']:
-                result['errors'].extend(parsed_data.get('errors', []))
-                return result
-            
-            # Process the same way as file parsing
-            raw_text = parsed_data['text']
-            result['metadata'] = parsed_data.get('metadata', {})
-            
-            cleaned_text = self.preprocessor.clean_text(raw_text)
-            result['text'] = cleaned_text
-            
-            sections = self.section_detector.detect_sections(cleaned_text)
-            result['sections'] = sections
-            
-            result['success'] = True
-            
+
+            # Every registered parser handles bytes directly; no
+            # write-to-temp-file round trip
+            parser = self.format_parsers['.' + format_type]
+            return self._finalize(result, parser.parse_bytes(file_content))
+
         except Exception as e:
             result['errors'].append(f"Error parsing document: {str(e)}")
             result['success'] = False
-        
+
         return result
\ No newline at end of file
@@ -1,13 +1,30 @@
 import io
-from typing import Dict, Any, Optional
+from typing import Any, Dict, Optional, Union
 import zipfile
 
+from lxml import etree
+
 try:
     from docx import Document
     HAS_PYTHON_DOCX = True
 except ImportError:
     HAS_PYTHON_DOCX = False
 
+# WordprocessingML tags used for direct extraction from the lxml tree
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_P_TAG = f"{{{_W_NS}}}p"
+_TBL_TAG = f"{{{_W_NS}}}tbl"
+_TR_TAG = f"{{{_W_NS}}}tr"
+_TC_TAG = f"{{{_W_NS}}}tc"
+_T_TAG = f"{{{_W_NS}}}t"
+_PSTYLE_PATH = f"{{{_W_NS}}}pPr/{{{_W_NS}}}pStyle"
+_VAL_ATTR = f"{{{_W_NS}}}val"
+
+
+def _element_text(element) -> str:
+    """Concatenate the w:t run texts under an element."""
+    return "".join(t.text or "" for t in element.iter(_T_TAG))
+
 
 class DOCXParser:
     """
@@ -56,6 +73,37 @@ class DOCXParser:
         
         return result
     
+    def extract_text_only(self, source: Union[str, bytes]) -> str:
+        """
+        Fast text-only extraction that never touches python-docx.
+
+        Document() loads the styles, numbering and settings parts of the
+        package even when only body text is wanted; this path streams
+        word/document.xml straight out of the zip with iterparse instead,
+        keeping memory flat and skipping the extra parts entirely. Table
+        cells are separated by \" | \" and paragraphs by newlines, but no
+        heading markers, table headers or metadata are produced — use
+        parse/parse_bytes when structure matters.
+
+        Args:
+            source: Path to a .docx file, or the raw bytes of one
+        """
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+
+        parts = []
+        with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document:
+            for _event, element in etree.iterparse(document, tag=(_T_TAG, _P_TAG, _TC_TAG)):
+                if element.tag == _T_TAG:
+                    if element.text:
+                        parts.append(element.text)
+                elif element.tag == _P_TAG:
+                    parts.append("\n")
+                    element.clear()
+                else:  # table cell boundary
+                    parts.append(" | ")
+        return "".join(parts).strip()
+
     def _extract_content(self, doc: Document) -> Dict[str, Any]:
         """Extract all content from DOCX document."""
         content = {
@@ -65,27 +113,47 @@ class DOCXParser:
         
         # Extract metadata
         content['metadata'] = self._extract_metadata(doc)
-        
+
+        # Work on the underlying lxml body directly: python-docx builds
+        # fresh wrapper objects on every paragraphs/tables/cells access,
+        # which dominates extraction time on long documents
+        body = doc.element.body
+        paragraphs = body.findall(_P_TAG)
+        tables = body.findall(_TBL_TAG)
+        content['metadata'].update({
+            'paragraphs': len(paragraphs),
+            'tables': len(tables)
+        })
+
         # Extract main document text
         text_parts = []
-        
+
         # Process paragraphs
-        for para in doc.paragraphs:
-            if para.text.strip():
+        for para in paragraphs:
+            para_text = _element_text(para)
+            if para_text.strip():
                 # Check if paragraph is a heading
-                if para.style.name.startswith('Heading'):
-                    text_parts.append(f"\n{'#' * int(para.style.name[-1])} {para.text}\n")
+                style = para.find(_PSTYLE_PATH)
+                style_id = style.get(_VAL_ATTR, '') if style is not None else ''
+                if style_id.startswith('Heading') and style_id[-1].isdigit():
+                    text_parts.append(f"\n{'#' * int(style_id[-1])} {para_text}\n")
                 else:
-                    text_parts.append(para.text)
-        
-        # Process tables
-        for table_num, table in enumerate(doc.tables):
-            table_text = f"\n--- Table {table_num + 1} ---\n"
-            for row in table.rows:
-                row_text = " | ".join([cell.text.strip() for cell in row.cells])
+                    text_parts.append(para_text)
+
+        # Process tables (collect rows and join once; += on a str is
+        # quadratic in table size)
+        for table_num, table in enumerate(tables):
+            rows = []
+            for row in table.findall(_TR_TAG):
+                row_text = " | ".join(
+                    "\n".join(_element_text(p) for p in cell.findall(_P_TAG)).strip()
+                    for cell in row.findall(_TC_TAG)
+                )
                 if row_text.strip():
-                    table_text += row_text + "\n"
-            text_parts.append(table_text)
+                    rows.append(row_text)
+            text_parts.append(
+                f"\n--- Table {table_num + 1} ---\n" + "\n".join(rows) + ("\n" if rows else "")
+            )
         
         # Extract headers and footers
         headers_footers = self._extract_headers_footers(doc)
@@ -100,26 +168,18 @@ class DOCXParser:
         metadata = {}
         
         try:
-            # Core properties
+            # Core properties, each read once and coerced to str
             core_props = doc.core_properties
-            metadata.update({
-                'title': getattr(core_props, 'title', '') or '',
-                'author': getattr(core_props, 'author', '') or '',
-                'subject': getattr(core_props, 'subject', '') or '',
-                'created': str(getattr(core_props, 'created', '') or ''),
-                'modified': str(getattr(core_props, 'modified', '') or ''),
-                'last_modified_by': getattr(core_props, 'last_modified_by', '') or '',
-                'revision': str(getattr(core_props, 'revision', '') or ''),
-                'category': getattr(core_props, 'category', '') or '',
-                'comments': getattr(core_props, 'comments', '') or ''
-            })
-            
-            # Document statistics
-            metadata.update({
-                'paragraphs': len(doc.paragraphs),
-                'tables': len(doc.tables)
-            })
-            
+            for field in ('title', 'author', 'subject', 'last_modified_by',
+                          'category', 'comments'):
+                metadata[field] = getattr(core_props, field, '') or ''
+            for field in ('created', 'modified', 'revision'):
+                metadata[field] = str(getattr(core_props, field, '') or '')
+
+            # Document statistics (paragraph/table counts) are filled in
+            # by _extract_content from the XML body, avoiding a second
+            # pass through python-docx's wrapper objects
+
         except Exception as e:
             metadata['metadata_error'] = str(e)
         
@@ -131,20 +191,21 @@ class DOCXParser:
         
         try:
             for section in doc.sections:
-                # Extract header
+                # A linked header/footer just inherits the previous
+                # section's content; skipping it avoids re-walking (and
+                # re-emitting) the same paragraphs through python-docx
                 header = section.header
-                if header:
+                if not header.is_linked_to_previous:
                     for para in header.paragraphs:
                         if para.text.strip():
                             headers_footers.append(f"Header: {para.text}")
-                
-                # Extract footer
+
                 footer = section.footer
-                if footer:
+                if not footer.is_linked_to_previous:
                     for para in footer.paragraphs:
                         if para.text.strip():
                             headers_footers.append(f"Footer: {para.text}")
-                            
+
         except Exception:
             pass  # Headers/footers extraction is optional
         
@@ -1,31 +1,46 @@
 import io
-from typing import Dict, Any, Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 import logging
 
-try:
-    import fitz  # PyMuPDF
-    HAS_PYMUPDF = True
-except ImportError:
-    HAS_PYMUPDF = False
+import importlib.util
 
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
 
-try:
-    import PyPDF2
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
+def _module_available(name: str) -> bool:
+    """Check for a backend without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import pytesseract
-    from PIL import Image
-    HAS_OCR = True
-except ImportError:
-    HAS_OCR = False
+
+# Availability is probed from module metadata only; the backends
+# themselves (fitz alone costs hundreds of ms and tens of MB) are
+# imported inside the methods that use them, so DOCX/TXT-only processes
+# and freshly spawned pool workers never pay for them
+HAS_PYMUPDF = _module_available("fitz")
+HAS_PDFPLUMBER = _module_available("pdfplumber")
+HAS_PYPDF2 = _module_available("PyPDF2")
+HAS_OCR = _module_available("pytesseract") and _module_available("PIL")
+
+
+def _open_sequential(file_path: str):
+    """
+    Open a file for buffered sequential reading.
+
+    Uses a 1 MiB buffer and, where the platform supports it, tells the
+    kernel the access pattern is sequential so readahead ramps up for
+    large documents.
+    """
+    f = open(file_path, 'rb', buffering=1024 * 1024)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
 
 
 class PDFParser:
@@ -33,22 +48,41 @@ class PDFParser:
     Enhanced PDF parser with multiple extraction strategies and OCR fallback.
     """
     
+    # A backend that yields less than this much text likely hit a
+    # scanned or degenerate PDF; the cascade keeps trying before
+    # settling for the short result
+    _MIN_TEXT_CHARS = 50
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.extraction_methods = []
-        
-        # Register available extraction methods in order of preference
-        if HAS_PDFPLUMBER:
-            self.extraction_methods.append(self._parse_with_pdfplumber)
+        self.bytes_extraction_methods = []
+
+        # Register available extraction methods in order of preference.
+        # PyMuPDF leads: it is roughly an order of magnitude faster than
+        # pdfplumber for plain text extraction, so the cascade reaches
+        # the slower backends only when it fails.
         if HAS_PYMUPDF:
             self.extraction_methods.append(self._parse_with_pymupdf)
+            self.bytes_extraction_methods.append(self._parse_bytes_with_pymupdf)
+        if HAS_PDFPLUMBER:
+            self.extraction_methods.append(self._parse_with_pdfplumber)
+            self.bytes_extraction_methods.append(self._parse_bytes_with_pdfplumber)
         if HAS_PYPDF2:
             self.extraction_methods.append(self._parse_with_pypdf2)
-        
+            self.bytes_extraction_methods.append(self._parse_bytes_with_pypdf2)
+
         if not self.extraction_methods:
             raise ImportError("No PDF parsing libraries available. Install pdfplumber, PyMuPDF, or PyPDF2")
-    
-    def parse(self, file_path: str) -> Dict[str, Any]:
+
+    @staticmethod
+    def _order_methods(methods: list, prefer_tables: bool) -> list:
+        """Move pdfplumber to the front when table layout matters."""
+        if not prefer_tables:
+            return methods
+        return sorted(methods, key=lambda method: 'pdfplumber' not in method.__name__)
+
+    def parse(self, file_path: str, prefer_tables: bool = False) -> Dict[str, Any]:
         """Parse PDF file and extract text with metadata."""
         result = {
             'text': '',
@@ -57,30 +91,39 @@ class PDFParser:
             'errors': [],
             'method_used': None
         }
-        
-        # Try each extraction method until one succeeds
-        for method in self.extraction_methods:
+
+        # Try each method until one extracts substantial text; a short
+        # result is kept as a fallback but later methods still get a
+        # chance to do better
+        fallback_result = None
+        for method in self._order_methods(self.extraction_methods, prefer_tables):
             try:
                 method_result = method(file_path)
-                if method_result['success'] and method_result['text'].strip():
+                if method_result['success'] and len(method_result['text'].strip()) >= self._MIN_TEXT_CHARS:
                     result.update(method_result)
                     break
+                if fallback_result is None and method_result['success'] and method_result['text'].strip():
+                    fallback_result = method_result
             except Exception as e:
                 self.logger.warning(f"Method {method.__name__} failed: {str(e)}")
                 result['errors'].append(f"{method.__name__}: {str(e)}")
-        
-        # If no method succeeded and OCR is available, try OCR
-        if not result['success'] and HAS_OCR:
+
+        if not result['success'] and fallback_result is not None:
+            result.update(fallback_result)
+
+        # If no method succeeded and OCR is available, try OCR (which
+        # renders pages through fitz, so it needs PyMuPDF too)
+        if not result['success'] and HAS_OCR and HAS_PYMUPDF:
             try:
                 ocr_result = self._parse_with_ocr(file_path)
                 if ocr_result['success']:
                     result.update(ocr_result)
             except Exception as e:
                 result['errors'].append(f"OCR failed: {str(e)}")
-        
+
         return result
-    
-    def parse_bytes(self, file_content: bytes) -> Dict[str, Any]:
+
+    def parse_bytes(self, file_content: bytes, prefer_tables: bool = False) -> Dict[str, Any]:
         """Parse PDF from bytes content."""
         result = {
             'text': '',
@@ -89,34 +132,24 @@ class PDFParser:
             'errors': [],
             'method_used': None
         }
-        
-        # Try pdfplumber first (best for structured PDFs)
-        if HAS_PDFPLUMBER:
-            try:
-                result = self._parse_bytes_with_pdfplumber(file_content)
-                if result['success']:
-                    return result
-            except Exception as e:
-                result['errors'].append(f"pdfplumber: {str(e)}")
-        
-        # Try PyMuPDF
-        if HAS_PYMUPDF:
-            try:
-                result = self._parse_bytes_with_pymupdf(file_content)
-                if result['success']:
-                    return result
-            except Exception as e:
-                result['errors'].append(f"PyMuPDF: {str(e)}")
-        
-        # Try PyPDF2
-        if HAS_PYPDF2:
+
+        # Same cascade as parse: stop on the first substantial result
+        fallback_result = None
+        for method in self._order_methods(self.bytes_extraction_methods, prefer_tables):
             try:
-                result = self._parse_bytes_with_pypdf2(file_content)
-                if result['success']:
-                    return result
+                method_result = method(file_content)
+                if method_result['success'] and len(method_result['text'].strip()) >= self._MIN_TEXT_CHARS:
+                    result.update(method_result)
+                    break
+                if fallback_result is None and method_result['success'] and method_result['text'].strip():
+                    fallback_result = method_result
             except Exception as e:
-                result['errors'].append(f"PyPDF2: {str(e)}")
-        
+                self.logger.warning(f"Method {method.__name__} failed: {str(e)}")
+                result['errors'].append(f"{method.__name__}: {str(e)}")
+
+        if not result['success'] and fallback_result is not None:
+            result.update(fallback_result)
+
         return result
     
     def _parse_with_pdfplumber(self, file_path: str) -> Dict[str, Any]:
@@ -136,22 +169,32 @@ class PDFParser:
                 'subject': pdf.metadata.get('Subject', '')
             }
             
-            # Extract text from all pages
-            text_parts = []
+            # Extract text from all pages, streaming into one buffer so
+            # each page string can be dropped as soon as it's written
+            # instead of all pages plus the joined copy coexisting
+            buf = io.StringIO()
             for page_num, page in enumerate(pdf.pages):
                 page_text = page.extract_text()
                 if page_text:
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                
+                    if buf.tell():
+                        buf.write("\n\n")
+                    buf.write(f"--- Page {page_num + 1} ---\n")
+                    buf.write(page_text)
+
                 # Also extract tables if present
                 tables = page.extract_tables()
                 for table_num, table in enumerate(tables):
-                    table_text = f"\n--- Table {table_num + 1} on Page {page_num + 1} ---\n"
-                    for row in table:
-                        table_text += " | ".join([cell or "" for cell in row]) + "\n"
-                    text_parts.append(table_text)
-            
-            result['text'] = "\n\n".join(text_parts)
+                    if buf.tell():
+                        buf.write("\n\n")
+                    buf.write(f"\n--- Table {table_num + 1} on Page {page_num + 1} ---\n")
+                    for row_num, row in enumerate(table):
+                        if row_num:
+                            buf.write("\n")
+                        buf.write(" | ".join(cell or "" for cell in row))
+                    if table:
+                        buf.write("\n")
+
+            result['text'] = buf.getvalue()
             result['success'] = bool(result['text'].strip())
         
         return result
@@ -172,28 +215,90 @@ class PDFParser:
                 'subject': pdf.metadata.get('Subject', '')
             }
             
-            text_parts = []
+            # Stream into one buffer, same as the path-based variant
+            buf = io.StringIO()
             for page_num, page in enumerate(pdf.pages):
                 page_text = page.extract_text()
                 if page_text:
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                
+                    if buf.tell():
+                        buf.write("\n\n")
+                    buf.write(f"--- Page {page_num + 1} ---\n")
+                    buf.write(page_text)
+
                 tables = page.extract_tables()
                 for table_num, table in enumerate(tables):
-                    table_text = f"\n--- Table {table_num + 1} on Page {page_num + 1} ---\n"
-                    for row in table:
-                        table_text += " | ".join([cell or "" for cell in row]) + "\n"
-                    text_parts.append(table_text)
-            
-            result['text'] = "\n\n".join(text_parts)
+                    if buf.tell():
+                        buf.write("\n\n")
+                    buf.write(f"\n--- Table {table_num + 1} on Page {page_num + 1} ---\n")
+                    for row_num, row in enumerate(table):
+                        if row_num:
+                            buf.write("\n")
+                        buf.write(" | ".join(cell or "" for cell in row))
+                    if table:
+                        buf.write("\n")
+
+            result['text'] = buf.getvalue()
             result['success'] = bool(result['text'].strip())
         
         return result
     
+    def _extract_pymupdf_pages(self, doc, open_kwargs: Dict[str, Any]) -> List[str]:
+        """
+        Extract text from every page of an open fitz document.
+
+        fitz releases the GIL inside get_text, so large documents fan
+        the per-page calls out across a thread pool and reassemble the
+        results in page order; short documents stay sequential to avoid
+        pool overhead. A fitz Document is not safe for concurrent
+        access, so each worker thread opens its own handle on the same
+        source (open_kwargs) and the shared doc is never touched off
+        the calling thread.
+
+        flags=0 turns off every optional text-layer feature (ligature
+        preservation, whitespace preservation, mediabox clipping), which
+        is the cheapest extraction mode. Ligatures come back expanded to
+        plain ASCII — better for downstream keyword matching — and the
+        whitespace differences are erased by TextPreprocessor anyway.
+        """
+        import fitz
+
+        page_count = doc.page_count
+        if page_count >= 4:
+            local = threading.local()
+            thread_docs = []
+
+            def _page_text(page_num: int) -> str:
+                thread_doc = getattr(local, "doc", None)
+                if thread_doc is None:
+                    thread_doc = local.doc = fitz.open(**open_kwargs)
+                    thread_docs.append(thread_doc)
+                return thread_doc[page_num].get_text("text", flags=0, sort=False)
+
+            workers = min(8, os.cpu_count() or 1, page_count)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    page_texts = list(executor.map(_page_text, range(page_count)))
+            finally:
+                for thread_doc in thread_docs:
+                    thread_doc.close()
+        else:
+            page_texts = [
+                doc[page_num].get_text("text", flags=0, sort=False)
+                for page_num in range(page_count)
+            ]
+
+        return [
+            f"--- Page {page_num + 1} ---\n{page_text}"
+            for page_num, page_text in enumerate(page_texts)
+            if page_text.strip()
+        ]
+
     def _parse_with_pymupdf(self, file_path: str) -> Dict[str, Any]:
         """Parse PDF using PyMuPDF (fitz)."""
+        import fitz
+
         result = {'text': '', 'metadata': {}, 'success': False, 'method_used': 'PyMuPDF'}
-        
+
         with fitz.open(file_path) as doc:
             # Extract metadata
             metadata = doc.metadata
@@ -205,24 +310,21 @@ class PDFParser:
                 'creation_date': metadata.get('creationDate', ''),
                 'subject': metadata.get('subject', '')
             }
-            
+
             # Extract text from all pages
-            text_parts = []
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                if page_text.strip():
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-            
+            text_parts = self._extract_pymupdf_pages(doc, {'filename': file_path})
+
             result['text'] = "\n\n".join(text_parts)
             result['success'] = bool(result['text'].strip())
-        
+
         return result
-    
+
     def _parse_bytes_with_pymupdf(self, file_content: bytes) -> Dict[str, Any]:
         """Parse PDF bytes using PyMuPDF."""
+        import fitz
+
         result = {'text': '', 'metadata': {}, 'success': False, 'method_used': 'PyMuPDF'}
-        
+
         with fitz.open(stream=file_content, filetype="pdf") as doc:
             metadata = doc.metadata
             result['metadata'] = {
@@ -233,24 +335,23 @@ class PDFParser:
                 'creation_date': metadata.get('creationDate', ''),
                 'subject': metadata.get('subject', '')
             }
-            
-            text_parts = []
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                if page_text.strip():
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-            
+
+            text_parts = self._extract_pymupdf_pages(
+                doc, {'stream': file_content, 'filetype': 'pdf'}
+            )
+
             result['text'] = "\n\n".join(text_parts)
             result['success'] = bool(result['text'].strip())
-        
+
         return result
     
     def _parse_with_pypdf2(self, file_path: str) -> Dict[str, Any]:
         """Parse PDF using PyPDF2."""
+        import PyPDF2
+
         result = {'text': '', 'metadata': {}, 'success': False, 'method_used': 'PyPDF2'}
         
-        with open(file_path, 'rb') as file:
+        with _open_sequential(file_path) as file:
             reader = PyPDF2.PdfReader(file)
             
             # Extract metadata
@@ -264,20 +365,25 @@ class PDFParser:
                 'subject': metadata.get('/Subject', '') if metadata else ''
             }
             
-            # Extract text from all pages
-            text_parts = []
+            # Extract text from all pages, streaming into one buffer
+            buf = io.StringIO()
             for page_num, page in enumerate(reader.pages):
                 page_text = page.extract_text()
                 if page_text.strip():
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-            
-            result['text'] = "\n\n".join(text_parts)
+                    if buf.tell():
+                        buf.write("\n\n")
+                    buf.write(f"--- Page {page_num + 1} ---\n")
+                    buf.write(page_text)
+
+            result['text'] = buf.getvalue()
             result['success'] = bool(result['text'].strip())
         
         return result
     
     def _parse_bytes_with_pypdf2(self, file_content: bytes) -> Dict[str, Any]:
         """Parse PDF bytes using PyPDF2."""
+        import PyPDF2
+
         result = {'text': '', 'metadata': {}, 'success': False, 'method_used': 'PyPDF2'}
         
         reader = PyPDF2.PdfReader(io.BytesIO(file_content))
@@ -292,39 +398,59 @@ class PDFParser:
             'subject': metadata.get('/Subject', '') if metadata else ''
         }
         
-        text_parts = []
+        # Stream into one buffer, same as the path-based variant
+        buf = io.StringIO()
         for page_num, page in enumerate(reader.pages):
             page_text = page.extract_text()
             if page_text.strip():
-                text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-        
-        result['text'] = "\n\n".join(text_parts)
+                if buf.tell():
+                    buf.write("\n\n")
+                buf.write(f"--- Page {page_num + 1} ---\n")
+                buf.write(page_text)
+
+        result['text'] = buf.getvalue()
         result['success'] = bool(result['text'].strip())
         
         return result
     
     def _parse_with_ocr(self, file_path: str) -> Dict[str, Any]:
         """Parse PDF using OCR (for scanned documents)."""
+        import fitz
+        import pytesseract
+        from PIL import Image
+
         result = {'text': '', 'metadata': {}, 'success': False, 'method_used': 'OCR'}
         
         # Convert PDF pages to images and OCR them
         with fitz.open(file_path) as doc:
             result['metadata'] = {'pages': doc.page_count}
-            
-            text_parts = []
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                # Convert page to image
-                pix = page.get_pixmap()
-                img_data = pix.tobytes("ppm")
-                img = Image.open(io.BytesIO(img_data))
-                
-                # OCR the image
-                page_text = pytesseract.image_to_string(img)
-                if page_text.strip():
-                    text_parts.append(f"--- Page {page_num + 1} (OCR) ---\n{page_text}")
-            
+
+            # Render pixmaps up front on this thread (fitz pages aren't
+            # reliably thread-safe), then OCR them in parallel: tesseract
+            # runs outside the GIL, so pages OCR concurrently
+            pixmaps = [doc[page_num].get_pixmap() for page_num in range(doc.page_count)]
+
+            def _ocr_page(pix):
+                # Wrap the raw pixmap buffer directly; tobytes("ppm") +
+                # Image.open would encode and re-decode the whole image
+                mode = "RGBA" if pix.alpha else "RGB"
+                img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+                return pytesseract.image_to_string(img)
+
+            if len(pixmaps) >= 2:
+                workers = min(8, os.cpu_count() or 1, len(pixmaps))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    page_texts = list(executor.map(_ocr_page, pixmaps))
+            else:
+                page_texts = [_ocr_page(pix) for pix in pixmaps]
+
+            text_parts = [
+                f"--- Page {page_num + 1} (OCR) ---\n{page_text}"
+                for page_num, page_text in enumerate(page_texts)
+                if page_text.strip()
+            ]
+
             result['text'] = "\n\n".join(text_parts)
             result['success'] = bool(result['text'].strip())
-        
+
         return result
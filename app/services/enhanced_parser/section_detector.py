@@ -1,63 +1,177 @@
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Compiled once at import; these run on every header comparison and
+# would otherwise round-trip through re's internal cache per call
+_TITLE_PUNCT_RE = re.compile(r'[^\w\s]')
+_LEVEL_PATTERNS = [
+    (re.compile(r'^\d+\.$'), 1),           # Top level: "1.", "2."
+    (re.compile(r'^\d+\.\d+\.$'), 2),      # Second level: "1.1.", "2.3."
+    (re.compile(r'^\d+\.\d+\.\d+\.$'), 3), # Third level: "1.1.1.", "2.3.4."
+    (re.compile(r'^[IVX]+\.$'), 1),        # Roman numerals at top level
+    (re.compile(r'^[A-Z]\.$'), 2),         # Letters at second level
+    (re.compile(r'^\([a-z]\)$'), 3),       # Parenthetical letters at third level
+]
+
+# Patterns for different section header styles; tuple order is priority
+# order when several styles match the same position
+_SECTION_PATTERNS = (
+    # Numbered sections: "1.", "1.1", "Section 1"
+    r'^(\d+(?:\.\d+)*\.)\s+(.+)$',
+    r'^(?i:Section|Article)\s+(\d+(?:\.\d+)*)[:\.]?\s*(.*)$',
+
+    # Roman numerals: "I.", "II.", "III."
+    r'^([IVX]+\.)\s+(.+)$',
+
+    # Lettered sections: "A.", "B.", "(a)", "(b)"
+    r'^([A-Z]\.)\s+(.+)$',
+    r'^\(([a-z])\)\s+(.+)$',
+
+    # ALL CAPS headers
+    r'^([A-Z\s]{3,})$',
+
+    # Title case headers (likely section headers)
+    r'^([A-Z][a-z\s]+(?:[A-Z][a-z\s]+)*):?\s*$',
+)
+
+# All styles fused into one alternation so the document is scanned once
+# instead of once per pattern; each branch is a named group and matches
+# arrive already position-sorted
+_COMBINED_PATTERN = re.compile(
+    '|'.join(f'(?P<h{i}>{p})' for i, p in enumerate(_SECTION_PATTERNS)),
+    re.MULTILINE
+)
+
+
+def _compute_branch_groups(patterns) -> List[List[int]]:
+    """Absolute indices of each branch's inner capture groups within
+    the combined pattern."""
+    branch_groups = []
+    index = 1
+    for pattern in patterns:
+        inner_count = re.compile(pattern, re.MULTILINE).groups
+        branch_groups.append(list(range(index + 1, index + 1 + inner_count)))
+        index += 1 + inner_count
+    return branch_groups
+
+
+_BRANCH_GROUPS = _compute_branch_groups(_SECTION_PATTERNS)
+
+# Common contract section keywords
+_SECTION_KEYWORDS = (
+    'definitions', 'interpretation', 'parties', 'scope', 'term', 'duration',
+    'obligations', 'payment', 'fees', 'termination', 'confidentiality',
+    'warranty', 'liability', 'indemnification', 'dispute', 'governing law',
+    'amendment', 'assignment', 'force majeure', 'severability', 'entire agreement',
+    'notices', 'counterparts', 'execution', 'representations', 'covenants'
+)
+
+# Synonym fallbacks consulted after the exact keyword list; each group
+# maps to the canonical section type on the left
+_SYNONYM_GROUPS = (
+    ('definitions', ['definition', 'meaning', 'interpretation']),
+    ('payment', ['payment', 'fee', 'cost', 'price']),
+    ('term', ['term', 'duration', 'period']),
+    ('obligations', ['obligation', 'duty', 'requirement']),
+    ('termination', ['termination', 'expiration', 'end']),
+    ('confidentiality', ['confidential', 'non-disclosure', 'privacy']),
+    ('dispute', ['dispute', 'resolution', 'arbitration']),
+)
+
+# The groups flattened to synonym -> canonical type, in group priority
+# order, so the no-automaton fallback scans the title once per synonym
+# instead of once per synonym per any() chain
+_SYNONYM_LOOKUP: Dict[str, str] = {}
+for _section_type, _words in _SYNONYM_GROUPS:
+    for _word in _words:
+        _SYNONYM_LOOKUP.setdefault(_word, _section_type)
+del _section_type, _words, _word
+
+
+def _build_classify_automaton() -> Optional[Any]:
+    """All classification keywords in one Aho-Corasick automaton so a
+    title is scanned once instead of once per keyword; payloads carry
+    the list position so the original priority order survives."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    rank = 0
+    for keyword in _SECTION_KEYWORDS:
+        automaton.add_word(keyword, (rank, keyword))
+        rank += 1
+    for section_type, words in _SYNONYM_GROUPS:
+        for word in words:
+            # Words already in the exact keyword list keep their
+            # higher-priority payload
+            if not automaton.exists(word):
+                automaton.add_word(word, (rank, section_type))
+        rank += 1
+    automaton.make_automaton()
+    return automaton
+
+
+_CLASSIFY_AUTOMATON = _build_classify_automaton()
 
 
 class SectionDetector:
     """
     Detects and extracts sections from contract documents.
     """
-    
+
     def __init__(self):
-        # Patterns for different section header styles
-        self.section_patterns = [
-            # Numbered sections: "1.", "1.1", "Section 1"
-            re.compile(r'^(\d+(?:\.\d+)*\.)\s+(.+)$', re.MULTILINE),
-            re.compile(r'^(?:Section|Article)\s+(\d+(?:\.\d+)*)[:\.]?\s*(.*)$', re.MULTILINE | re.IGNORECASE),
-            
-            # Roman numerals: "I.", "II.", "III."
-            re.compile(r'^([IVX]+\.)\s+(.+)$', re.MULTILINE),
-            
-            # Lettered sections: "A.", "B.", "(a)", "(b)"
-            re.compile(r'^([A-Z]\.)\s+(.+)$', re.MULTILINE),
-            re.compile(r'^\(([a-z])\)\s+(.+)$', re.MULTILINE),
-            
-            # ALL CAPS headers
-            re.compile(r'^([A-Z\s]{3,})$', re.MULTILINE),
-            
-            # Title case headers (likely section headers)
-            re.compile(r'^([A-Z][a-z\s]+(?:[A-Z][a-z\s]+)*):?\s*$', re.MULTILINE),
-        ]
-        
-        # Common contract section keywords
-        self.section_keywords = [
-            'definitions', 'interpretation', 'parties', 'scope', 'term', 'duration',
-            'obligations', 'payment', 'fees', 'termination', 'confidentiality',
-            'warranty', 'liability', 'indemnification', 'dispute', 'governing law',
-            'amendment', 'assignment', 'force majeure', 'severability', 'entire agreement',
-            'notices', 'counterparts', 'execution', 'representations', 'covenants'
-        ]
-    
+        # Everything compiled lives at module scope, built once at
+        # import; instances just alias it, so constructing a detector
+        # per parser (or per worker process) costs nothing
+        self.section_patterns = list(_SECTION_PATTERNS)
+        self._combined_pattern = _COMBINED_PATTERN
+        self._branch_groups = _BRANCH_GROUPS
+        self.section_keywords = list(_SECTION_KEYWORDS)
+        self._synonym_groups = list(_SYNONYM_GROUPS)
+        self._classify_automaton = _CLASSIFY_AUTOMATON
+
     def detect_sections(self, text: str) -> List[Dict[str, Any]]:
         """
         Detect and extract sections from text.
-        
+
         Args:
             text: Cleaned document text
-            
+
         Returns:
             List of section dictionaries with metadata
         """
+        return list(self.iter_sections(text))
+
+    def iter_sections(self, text: str):
+        """
+        Detect sections and yield them one at a time.
+
+        Streaming consumers (classification, indexing) hold one
+        section's content copy at a time this way instead of every
+        section's at once; detect_sections wraps this for callers that
+        want the full list.
+
+        Args:
+            text: Cleaned document text
+
+        Yields:
+            Section dictionaries with metadata
+        """
         if not text:
-            return []
-        
-        sections = []
-        
+            return
+
         # Find all potential section headers
         potential_headers = self._find_section_headers(text)
-        
+
         if not potential_headers:
             # If no headers found, treat whole text as one section
-            return [{
+            yield {
                 'number': '1',
                 'title': 'Document Content',
                 'content': text,
@@ -65,21 +179,22 @@ class SectionDetector:
                 'end_pos': len(text),
                 'level': 1,
                 'type': 'content'
-            }]
-        
+            }
+            return
+
         # Extract sections based on headers
         for i, header in enumerate(potential_headers):
             section_start = header['start']
             section_end = potential_headers[i + 1]['start'] if i + 1 < len(potential_headers) else len(text)
-            
+
             section_content = text[section_start:section_end].strip()
-            
+
             # Remove the header from content
             header_text = header['full_match']
             if section_content.startswith(header_text):
                 section_content = section_content[len(header_text):].strip()
-            
-            section = {
+
+            yield {
                 'number': header['number'],
                 'title': header['title'],
                 'content': section_content,
@@ -88,113 +203,90 @@ class SectionDetector:
                 'level': self._determine_level(header['number']),
                 'type': self._classify_section(header['title'])
             }
-            
-            sections.append(section)
-        
-        return sections
     
     def _find_section_headers(self, text: str) -> List[Dict[str, Any]]:
-        """Find all potential section headers in text."""
+        """Find all potential section headers in one pass over the text."""
         headers = []
-        
-        for pattern in self.section_patterns:
-            for match in pattern.finditer(text):
-                if len(match.groups()) >= 2:
-                    number = match.group(1).strip()
-                    title = match.group(2).strip()
-                elif len(match.groups()) == 1:
-                    # For ALL CAPS or title case patterns
-                    title = match.group(1).strip()
-                    number = str(len(headers) + 1)
-                else:
-                    continue
-                
-                headers.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'number': number,
-                    'title': title,
-                    'full_match': match.group(0),
-                    'pattern_type': str(pattern.pattern)
-                })
-        
-        # Sort by position in text
-        headers.sort(key=lambda x: x['start'])
-        
+
+        for match in self._combined_pattern.finditer(text):
+            branch = int(match.lastgroup[1:])
+            inner = self._branch_groups[branch]
+            if len(inner) >= 2:
+                number = (match.group(inner[0]) or '').strip()
+                title = (match.group(inner[1]) or '').strip()
+            elif len(inner) == 1:
+                # For ALL CAPS or title case patterns
+                title = (match.group(inner[0]) or '').strip()
+                number = str(len(headers) + 1)
+            else:
+                continue
+
+            headers.append({
+                'start': match.start(),
+                'end': match.end(),
+                'number': number,
+                'title': title,
+                'full_match': match.group(0),
+                'pattern_type': self.section_patterns[branch]
+            })
+
+        # finditer already yields matches position-sorted; no sort needed
+
         # Remove duplicates and overlapping matches
         headers = self._deduplicate_headers(headers)
-        
+
         return headers
     
     def _deduplicate_headers(self, headers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate and overlapping headers."""
-        if not headers:
-            return []
-        
-        deduplicated = [headers[0]]
-        
-        for header in headers[1:]:
-            last_header = deduplicated[-1]
-            
-            # Skip if too close to previous header (likely overlap)
-            if header['start'] - last_header['end'] < 10:
+        deduplicated = []
+        seen_titles = set()
+        last_end = None
+
+        for header in headers:
+            # Skip if too close to previous surviving header (likely overlap)
+            if last_end is not None and header['start'] - last_end < 10:
                 continue
-            
-            # Skip if title is too similar to previous
-            if self._similar_titles(header['title'], last_header['title']):
+
+            # Normalize once per header; a set membership check replaces
+            # the regex-per-comparison title similarity test, and also
+            # catches duplicates that aren't adjacent survivors
+            normalized = _TITLE_PUNCT_RE.sub('', header['title'].lower())
+            if normalized in seen_titles:
                 continue
-            
+
             deduplicated.append(header)
-        
+            seen_titles.add(normalized)
+            last_end = header['end']
+
         return deduplicated
-    
-    def _similar_titles(self, title1: str, title2: str) -> bool:
-        """Check if two titles are similar (to avoid duplicates)."""
-        # Simple similarity check - could be enhanced
-        title1_clean = re.sub(r'[^\w\s]', '', title1.lower())
-        title2_clean = re.sub(r'[^\w\s]', '', title2.lower())
-        
-        return title1_clean == title2_clean
-    
+
     def _determine_level(self, number: str) -> int:
         """Determine the hierarchical level of a section."""
-        if re.match(r'^\d+\.$', number):
-            return 1  # Top level: "1.", "2."
-        elif re.match(r'^\d+\.\d+\.$', number):
-            return 2  # Second level: "1.1.", "2.3."
-        elif re.match(r'^\d+\.\d+\.\d+\.$', number):
-            return 3  # Third level: "1.1.1.", "2.3.4."
-        elif re.match(r'^[IVX]+\.$', number):
-            return 1  # Roman numerals at top level
-        elif re.match(r'^[A-Z]\.$', number):
-            return 2  # Letters at second level
-        elif re.match(r'^\([a-z]\)$', number):
-            return 3  # Parenthetical lowercase letters at third level
-        else:
-            return 1  # Default to top level
+        for pattern, level in _LEVEL_PATTERNS:
+            if pattern.match(number):
+                return level
+        return 1  # Default to top level
     
     def _classify_section(self, title: str) -> str:
         """Classify section type based on title."""
         title_lower = title.lower()
-        
+
+        if self._classify_automaton is not None:
+            # One pass over the title; the lowest rank wins, which is
+            # exactly the order the substring scans below check in
+            best = None
+            for _end, payload in self._classify_automaton.iter(title_lower):
+                if best is None or payload < best:
+                    best = payload
+            return best[1] if best is not None else 'general'
+
         for keyword in self.section_keywords:
             if keyword in title_lower:
                 return keyword
-        
-        # Check for common patterns
-        if any(word in title_lower for word in ['definition', 'meaning', 'interpretation']):
-            return 'definitions'
-        elif any(word in title_lower for word in ['payment', 'fee', 'cost', 'price']):
-            return 'payment'
-        elif any(word in title_lower for word in ['term', 'duration', 'period']):
-            return 'term'
-        elif any(word in title_lower for word in ['obligation', 'duty', 'requirement']):
-            return 'obligations'
-        elif any(word in title_lower for word in ['termination', 'expiration', 'end']):
-            return 'termination'
-        elif any(word in title_lower for word in ['confidential', 'non-disclosure', 'privacy']):
-            return 'confidentiality'
-        elif any(word in title_lower for word in ['dispute', 'resolution', 'arbitration']):
-            return 'dispute'
-        else:
-            return 'general'
\ No newline at end of file
+
+        # Check for common patterns; dict order preserves group priority
+        for word, section_type in _SYNONYM_LOOKUP.items():
+            if word in title_lower:
+                return section_type
+        return 'general'
\ No newline at end of file
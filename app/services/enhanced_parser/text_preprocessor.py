@@ -1,5 +1,25 @@
 import re
-from typing import str
+
+# Page/table marker shapes emitted by the parsers; shared between the
+# artifact branches below
+_MARKER = r'---\s*Page\s+\d+\s*---|---\s*Table\s+\d+.*?---'
+
+
+class _EncodingTable(dict):
+    """
+    str.translate table for the encoding fixes: explicit entries win
+    and any unlisted non-ASCII character becomes a space. ASCII code
+    points get identity entries up front — raising LookupError from
+    __missing__ to mean "keep this character" costs an exception per
+    character and is far slower than the lookup it avoids.
+    """
+
+    def __missing__(self, code: int) -> str:
+        return ' '
+
+
+_ENCODING_TABLE = _EncodingTable({code: code for code in range(0x80)})
+_ENCODING_TABLE.update(str.maketrans({'`': '"', '–': '-', '—': '-'}))
 
 
 class TextPreprocessor:
@@ -10,30 +30,29 @@ class TextPreprocessor:
     def __init__(self):
         # Common patterns for cleaning
         self.patterns = {
-            # Remove excessive whitespace
-            'excessive_spaces': re.compile(r' {2,}'),
-            'excessive_newlines': re.compile(r'\n{3,}'),
-            
-            # Fix common parsing artifacts
-            'page_breaks': re.compile(r'---\s*Page\s+\d+\s*---'),
             'bullet_points': re.compile(r'^[\s]*[•·▪▫‣⁃]\s*', re.MULTILINE),
             'numbering': re.compile(r'^\s*\d+\.\s+', re.MULTILINE),
-            
-            # Clean up formatting
-            'header_footer': re.compile(r'(?:Header|Footer):\s*', re.IGNORECASE),
-            'table_markers': re.compile(r'---\s*Table\s+\d+.*?---'),
-            
-            # Fix encoding issues
-            'smart_quotes': re.compile(r'[""''`]'),
-            'unicode_dashes': re.compile(r'[–—]'),
-            'weird_chars': re.compile(r'[^\x00-\x7F]+')
-        }
-        
-        # Replacement patterns
-        self.replacements = {
-            self.patterns['smart_quotes']: '"',
-            self.patterns['unicode_dashes']: '-',
-            self.patterns['weird_chars']: ' '
+
+            # Parser artifacts (page/table markers, header/footer labels)
+            # removed in one sweep with a dispatching replacement instead
+            # of three passes. The hf branch also swallows markers that
+            # follow the label, matching the old pass order where the
+            # label was stripped after markers became bare newlines
+            'artifacts': re.compile(
+                rf'(?P<mk>{_MARKER})'
+                rf'|(?P<hf>(?i:Header|Footer):\s*(?:(?:{_MARKER})\s*)*)'
+            ),
+
+            # Whitespace normalization in one sweep: any run containing a
+            # newline collapses to a single newline, any other run of two
+            # or more spaces collapses to one space. Maximal whitespace
+            # runs are disjoint, so this matches the old three sequential
+            # passes (excessive_newlines was always re-collapsed by the
+            # line-break pass anyway)
+            'whitespace': re.compile(r'(?P<nl>\s*\n\s*)|(?P<sp> {2,})'),
+
+            'blank_lines': re.compile(r'\n\s*\n'),
+            'numbered_list': re.compile(r'^\s*(\d+)\.\s+', re.MULTILINE)
         }
     
     def clean_text(self, raw_text: str) -> str:
@@ -70,35 +89,34 @@ class TextPreprocessor:
     
     def _fix_encoding_issues(self, text: str) -> str:
         """Fix common encoding and character issues."""
-        for pattern, replacement in self.replacements.items():
-            text = pattern.sub(replacement, text)
-        return text
+        # Pure-ASCII fast path: isascii is O(1) on CPython, and the
+        # only ASCII character the table rewrites is the backtick
+        if text.isascii():
+            return text.replace('`', '"') if '`' in text else text
+
+        # Single-character substitutions don't need the regex engine at
+        # all; translate walks the string once in C
+        return text.translate(_ENCODING_TABLE)
     
+    @staticmethod
+    def _artifact_replacement(match) -> str:
+        """Map one matched parsing artifact to its replacement."""
+        # Page and table markers become line breaks; header/footer
+        # labels are dropped outright
+        return '' if match.lastgroup == 'hf' else '\n'
+
     def _remove_parsing_artifacts(self, text: str) -> str:
         """Remove common parsing artifacts like page markers."""
-        # Remove page break markers
-        text = self.patterns['page_breaks'].sub('\n', text)
-        
-        # Remove table markers
-        text = self.patterns['table_markers'].sub('\n', text)
-        
-        # Clean header/footer markers
-        text = self.patterns['header_footer'].sub('', text)
-        
-        return text
-    
+        return self.patterns['artifacts'].sub(self._artifact_replacement, text)
+
+    @staticmethod
+    def _whitespace_replacement(match) -> str:
+        """Collapse one whitespace run to a newline or a space."""
+        return '\n' if match.lastgroup == 'nl' else ' '
+
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize spacing and line breaks."""
-        # Replace multiple spaces with single space
-        text = self.patterns['excessive_spaces'].sub(' ', text)
-        
-        # Replace multiple newlines with double newline
-        text = self.patterns['excessive_newlines'].sub('\n\n', text)
-        
-        # Fix spacing around line breaks
-        text = re.sub(r'\s*\n\s*', '\n', text)
-        
-        return text
+        return self.patterns['whitespace'].sub(self._whitespace_replacement, text)
     
     def _clean_formatting(self, text: str) -> str:
         """Clean up bullet points and numbering."""
@@ -106,7 +124,7 @@ class TextPreprocessor:
         text = self.patterns['bullet_points'].sub('• ', text)
         
         # Clean up numbered lists
-        text = re.sub(r'^\s*(\d+)\.\s+', r'\1. ', text, flags=re.MULTILINE)
+        text = self.patterns['numbered_list'].sub(r'\1. ', text)
         
         return text
     
@@ -126,6 +144,6 @@ class TextPreprocessor:
         text = '\n'.join(cleaned_lines)
         
         # Final whitespace normalization
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        text = self.patterns['blank_lines'].sub('\n\n', text)
         
         return text
\ No newline at end of file
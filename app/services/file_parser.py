@@ -1,12 +1,19 @@
-from typing import Optional, Tuple
+import tempfile
+from typing import BinaryIO, Optional, Tuple
 
 from fastapi import HTTPException, UploadFile
 
 from app.services.pdf_parser import parse_pdf
 from app.services.docx_parser import parse_docx
 
+# Uploads are consumed in chunks of this size instead of one big read
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-async def get_file_type(filename: str) -> str:
+# Files up to this size are spooled in memory; larger ones roll to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def get_file_type(filename: str) -> str:
     """
     Determine file type from filename.
     """
@@ -24,25 +31,37 @@ async def get_file_type(filename: str) -> str:
 async def parse_contract_text(file: UploadFile) -> Tuple[str, str]:
     """
     Parse contract text from an uploaded file.
+    The upload is streamed chunk by chunk into a spooled temporary file
+    so large documents never sit fully in memory twice.
     Returns a tuple of (file_type, extracted_text)
     """
 
-    file_type = await get_file_type(file.filename)
+    file_type = get_file_type(file.filename)
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file")
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            spool.write(chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        spool.seek(0)
+
+        if file_type == "pdf":
+            text = await parse_pdf(spool)
+        elif file_type == "docx":
+            text = await parse_docx(spool)
+        else:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+    finally:
+        spool.close()
 
-    if file_type == "pdf":
-        text = await parse_pdf(content)
-    elif file_type == "docx":
-        text = await parse_docx(content)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
-    
     if text is None or text == "":
         raise HTTPException(status_code=422, detail="Could not extract text from file")
 
     await file.seek(0)
-    
-    return file_type, text
\ No newline at end of file
+
+    return file_type, text
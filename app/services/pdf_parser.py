@@ -1,19 +1,86 @@
-import io
-from typing import Optional
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Optional
 
-import fitz  
+import fitz
 
+logger = logging.getLogger(__name__)
 
-async def parse_pdf(file_content: bytes) -> Optional[str]:
+# Below this page count the pool's setup cost outweighs the overlap
+_PARALLEL_PAGE_THRESHOLD = 8
+
+
+async def parse_pdf(file_obj: BinaryIO) -> Optional[str]:
+    """
+    Extract text from a PDF file object using PyMuPDF.
+
+    get_text is synchronous and CPU-bound, so the extraction runs on a
+    worker thread; the event loop keeps serving other uploads while a
+    large contract is parsed.
+    """
+    return await asyncio.to_thread(_parse_pdf_sync, file_obj)
+
+
+def _document_source(file_obj: BinaryIO) -> Dict[str, object]:
+    """
+    fitz.open kwargs for the cheapest source available.
+
+    Uploads above the spool threshold already sit in a temp file on
+    disk; opening that path directly lets MuPDF read pages lazily from
+    the file instead of the whole document being copied back into
+    memory first. In-memory spools and other handles fall back to the
+    stream interface.
+    """
+    path = getattr(file_obj, "name", None)
+    if isinstance(path, str) and os.path.exists(path):
+        file_obj.flush()
+        return {"filename": path, "filetype": "pdf"}
+    return {"stream": file_obj.read(), "filetype": "pdf"}
+
+
+def _extract_pages_parallel(source: Dict[str, object], page_count: int) -> str:
     """
-    Extract text from a PDF file using PyMuPDF.
+    Extract all pages across worker threads, joined in page order.
+
+    A fitz Document is not safe for concurrent access, so each worker
+    thread opens its own handle on the same source via threading.local
+    instead of sharing one document; MuPDF still releases the GIL
+    inside each per-thread get_text, so the threads overlap.
     """
+    local = threading.local()
+    thread_docs = []
+
+    def _page_text(page_num: int) -> str:
+        doc = getattr(local, "doc", None)
+        if doc is None:
+            doc = local.doc = fitz.open(**source)
+            thread_docs.append(doc)
+        return doc[page_num].get_text()
+
+    workers = min(8, os.cpu_count() or 1, page_count)
     try:
-        with fitz.open(stream=file_content, filetype="pdf") as pdf:
-            text = ""
-            for page in pdf:
-                text += page.get_text()
-            return text.strip()
-    except Exception as e:
-        print(f"Error parsing PDF: {str(e)}")
-        return None
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return "".join(executor.map(_page_text, range(page_count))).strip()
+    finally:
+        for doc in thread_docs:
+            doc.close()
+
+
+def _parse_pdf_sync(file_obj: BinaryIO) -> Optional[str]:
+    try:
+        source = _document_source(file_obj)
+        with fitz.open(**source) as pdf:
+            page_count = pdf.page_count
+
+            if page_count > _PARALLEL_PAGE_THRESHOLD:
+                return _extract_pages_parallel(source, page_count)
+
+            # join once instead of += per page, which recopies the
+            # accumulated text on every iteration
+            return "".join(page.get_text() for page in pdf).strip()
+    except Exception:
+        logger.exception("Error parsing PDF")
+        return None
@@ -0,0 +1,43 @@
+"""
+Regex compilation helper for the clause-matching hot paths.
+
+Prefers google-re2 when installed: RE2 is a linear-time DFA engine, so a
+document is scanned in O(n) with no catastrophic backtracking regardless
+of how adversarial the clause text is. Next choice is the third-party
+`regex` module, whose matcher is faster than stdlib `re` on the literal
+alternations this package generates. Falls back to the stdlib engine
+when neither is available or a pattern is rejected (backreferences,
+lookaround under RE2).
+"""
+import re
+
+try:
+    import re2 as _re2
+    RE2_AVAILABLE = True
+except ImportError:
+    _re2 = None
+    RE2_AVAILABLE = False
+
+try:
+    import regex as _regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    _regex = None
+    REGEX_AVAILABLE = False
+
+
+def compile(pattern: str, flags: int = 0):
+    """Compile a pattern with RE2, the regex module, or stdlib re."""
+    if RE2_AVAILABLE:
+        try:
+            return _re2.compile(pattern, flags)
+        except Exception:
+            # RE2 doesn't support every construct; fall through
+            pass
+    if REGEX_AVAILABLE:
+        try:
+            # regex accepts the stdlib flag constants
+            return _regex.compile(pattern, flags)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
@@ -1,13 +1,29 @@
 import os
 
 def get_all_python_files(directory: str):
-    python_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".py"):
-                full_path = os.path.join(root, file)
-                python_files.append(full_path)
-    return python_files
+    """Yield paths of .py files under directory, depth-first.
+
+    os.walk discards the type information scandir already fetched and
+    re-stats each entry; walking with scandir directly uses the cached
+    DirEntry results, one stat per file instead of two. Yielding keeps
+    memory flat no matter how big the tree is.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue  # unreadable directory, same as os.walk's default
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                        yield entry.path
+                except OSError:
+                    continue
 
 def extract_code_from_file(filepath: str) -> str:
     try:
@@ -27,6 +43,21 @@ def extract_all_code_with_headers(directory: str) -> str:
 
     return "\n".join(output)
 
+def write_all_code_with_headers(directory: str, output_path: str) -> None:
+    """Stream the extracted code straight to output_path.
+
+    extract_all_code_with_headers holds every file plus the joined
+    result in memory at once — about twice the codebase. Writing each
+    file as it is read keeps peak memory at one file's worth.
+    """
+    with open(output_path, "w", encoding="utf-8") as out_file:
+        for path in get_all_python_files(directory):
+            if out_file.tell():
+                out_file.write("\n")
+            out_file.write(f"{'#' * 80}\n# FILE: {path}\n{'#' * 80}\n")
+            out_file.write(extract_code_from_file(path))
+            out_file.write("\n\n")
+
 if __name__ == "__main__":
     import argparse
 
@@ -35,10 +66,7 @@ if __name__ == "__main__":
     parser.add_argument("--output", help="File to save the output", default="extracted_code.txt")
     args = parser.parse_args()
 
-    final_output = extract_all_code_with_headers(args.directory)
-
-    with open(args.output, "w", encoding="utf-8") as out_file:
-        out_file.write(final_output)
+    write_all_code_with_headers(args.directory, args.output)
 
     print(f"✅ Python code extracted and saved to {args.output}")
 